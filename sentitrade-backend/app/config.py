@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
@@ -31,9 +33,20 @@ class Settings(BaseSettings):
     
     # Market Data (yfinance symbols)
     symbols: List[str] = ["BTC-USD", "AAPL", "GC=F"]  # Crypto, Stock, Gold
+    # yfinance is blocking HTTP, so size the thread pool for I/O rather than CPU
+    market_data_workers: int = min(32, (os.cpu_count() or 1) * 4)
+    
+    # NSE fetcher cache TTLs (seconds)
+    nse_quote_ttl_seconds: float = 3.0
+    nse_indices_ttl_seconds: float = 5.0
+    nse_history_ttl_seconds: float = 3600.0
+    # On-disk daily OHLC cache (survives restarts); outside the repo by default
+    history_cache_dir: str = os.path.join(tempfile.gettempdir(), "sentitrade", "history")
     
     # Streaming
     stream_interval_seconds: int = 5
+    # How long the whale simulator reuses a price snapshot (seconds)
+    whale_price_ttl_seconds: float = 30.0
 
     @field_validator("debug", mode="before")
     @classmethod
@@ -84,10 +84,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     data_manager = init_data_manager(ws_manager)
     await data_manager.start()
     logger.info("✅ Sovereign Data Manager started (15s polling)")    
+
+    # Pre-open NSE upstream connections in the background
+    from app.services.nse_fetcher import nse_fetcher
+    app.state.nse_warmup_task = asyncio.create_task(nse_fetcher.warmup())
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down SentiTrade Backend...")
+    warmup_task = app.state.nse_warmup_task
+    warmup_task.cancel()
+    try:
+        await warmup_task
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.warning(f"NSE warmup failed: {e}")
+    await nse_fetcher.close()
+    await whale_service.stop()  # Flushes buffered whale rows
     await engine.dispose()
 
 # Create FastAPI app
@@ -144,6 +158,7 @@ else:
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket connection for real-time updates"""
+    user_id = None
     try:
         token = websocket.query_params.get("token")
         user_id = "anonymous"
@@ -164,7 +179,7 @@ async def websocket_endpoint(websocket: WebSocket):
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
-        await ws_manager.disconnect(user_id if 'user_id' in locals() else None)
+        await ws_manager.disconnect(user_id, websocket)
 
 # Get DB session dependency
 async def get_db() -> AsyncGenerator:
@@ -182,4 +197,7 @@ if __name__ == "__main__":
         host=settings.backend_host,
         port=settings.backend_port,
         reload=settings.debug,
+        # Broadcasts send one pre-serialised frame to every client; per-message
+        # deflate would recompress it separately for each connection
+        ws_per_message_deflate=False,
     )
@@ -3,6 +3,7 @@ FinBERT Local Sentiment Analysis Service
 Uses ProsusAI/finbert model for financial text classification
 """
 
+import asyncio
 import logging
 from typing import Optional
 from functools import lru_cache
@@ -12,6 +13,10 @@ logger = logging.getLogger(__name__)
 # Lazy-load model to avoid startup delay
 _pipeline = None
 
+# Micro-batching for analyze_async: flush at this many texts or after this long
+MAX_BATCH_SIZE = 32
+MAX_BATCH_WAIT = 0.02  # seconds
+
 
 def get_finbert_pipeline():
     """Lazy-load the FinBERT model on first use"""
@@ -53,6 +58,8 @@ class FinBERTService:
     
     def __init__(self):
         self._ready = False
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
     
     async def ensure_ready(self) -> bool:
         """Check if model is loaded and ready, attempting to load if not"""
@@ -137,7 +144,9 @@ class FinBERTService:
             return [{"label": "neutral", "score": 50.0, "raw_score": 0.5} for _ in texts]
         
         try:
-            results = pipeline(texts)
+            # Without batch_size the pipeline runs one forward pass per text;
+            # this pads the texts together into a single (bounded) batch instead
+            results = pipeline(texts, batch_size=max(1, min(len(texts), MAX_BATCH_SIZE)))
             analyzed = []
             for result in results:
                 label = result["label"].lower()
@@ -159,6 +168,58 @@ class FinBERTService:
         except Exception as e:
             logger.error(f"FinBERT batch analysis error: {e}")
             return [{"label": "neutral", "score": 50.0, "raw_score": 0.5} for _ in texts]
+    
+    def analyze_dicts(self, items: list[dict], key: str = "headline") -> list[dict]:
+        """
+        Analyze the text stored under `key` in each dict.
+        
+        Results are aligned with `items`, so callers can zip them directly
+        without building their own text list first.
+        """
+        return self.analyze_batch([item.get(key, "") for item in items])
+    
+    async def analyze_async(self, text: str) -> dict:
+        """
+        Analyze a single text from async code.
+        
+        Concurrent calls are collected for up to MAX_BATCH_WAIT and run as
+        one batched forward pass off the event loop.
+        """
+        if self._batch_task is None or self._batch_task.done():
+            self._queue = asyncio.Queue()
+            self._batch_task = asyncio.create_task(self._batch_worker())
+        
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+    
+    async def _batch_worker(self):
+        """Drain queued texts into batches and resolve their futures."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + MAX_BATCH_WAIT
+            while len(batch) < MAX_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            texts = [text for text, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self.analyze_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
 
 
 # Singleton instance
@@ -93,14 +93,18 @@ class MarketAuditor:
             if circuit_msg:
                 flags.append(f"CIRCUIT_ERR: {circuit_msg}")
 
+        # Fast path: clean candles (the common case) skip the scoring work
+        if not flags:
+            return {"is_valid": True, "quality_score": 100, "flags": flags, "clean_data": candle}
+
         # 4. Data Quality Score
         quality_score = 100 - (len(flags) * 20)
         
         return {
-            "is_valid": len(flags) == 0,
+            "is_valid": False,
             "quality_score": max(0, quality_score),
             "flags": flags,
-            "clean_data": candle if len(flags) == 0 else None # Don't pass bad data
+            "clean_data": None # Don't pass bad data
         }
 
 market_auditor = MarketAuditor()
@@ -4,16 +4,20 @@ Provides real-time price data and trend detection for Crypto, Stocks, and Gold
 """
 
 import logging
-from typing import Optional, Literal
-from datetime import datetime, timedelta
+import time
+from typing import Any, Optional, Literal
+from datetime import datetime, timedelta, timezone
 from functools import lru_cache
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
-# Thread pool for async yfinance calls (yfinance is sync)
-_executor = ThreadPoolExecutor(max_workers=3)
+# Thread pool for async yfinance calls (yfinance is sync).
+# Workers are I/O-bound, so scale past the core count (override: MARKET_DATA_WORKERS)
+_executor = ThreadPoolExecutor(max_workers=settings.market_data_workers)
 
 
 def _fetch_ticker_info(symbol: str) -> dict:
@@ -54,17 +58,30 @@ def _fetch_history(symbol: str, period: str = "1d", interval: str = "1h") -> lis
         if hist.empty:
             return []
         
-        data = []
-        for idx, row in hist.iterrows():
-            data.append({
-                "time": idx.isoformat(),
-                "open": round(row["Open"], 2),
-                "high": round(row["High"], 2),
-                "low": round(row["Low"], 2),
-                "close": round(row["Close"], 2),
-                "volume": int(row["Volume"]),
-            })
-        return data
+        # Format the whole index in one pass (normalised to UTC) instead of per-row isoformat()
+        index = hist.index
+        index = index.tz_localize(timezone.utc) if index.tz is None else index.tz_convert(timezone.utc)
+        times = index.strftime("%Y-%m-%dT%H:%M:%S+00:00").tolist()
+
+        ohlc = hist[["Open", "High", "Low", "Close"]].round(2)
+        return [
+            {
+                "time": t,
+                "open": o,
+                "high": h,
+                "low": l,
+                "close": c,
+                "volume": v,
+            }
+            for t, o, h, l, c, v in zip(
+                times,
+                ohlc["Open"].tolist(),
+                ohlc["High"].tolist(),
+                ohlc["Low"].tolist(),
+                ohlc["Close"].tolist(),
+                hist["Volume"].astype("int64").tolist(),
+            )
+        ]
     except Exception as e:
         logger.error(f"Failed to fetch history for {symbol}: {e}")
         return []
@@ -95,6 +112,23 @@ def _search_tickers(query: str) -> list:
         logger.error(f"Failed to search {query}: {e}")
         return []
 
+def _load_nifty() -> list:
+    """Load the static NIFTY 500 database (empty list on failure)"""
+    import json
+    import os
+    try:
+        # Resolve path relative to this file
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        json_path = os.path.join(base_dir, "data", "nifty_500.json")
+        
+        with open(json_path, "r", encoding='utf-8') as f:
+            db = json.load(f)
+        print(f"Loaded {len(db)} stocks from database")
+        return db
+    except Exception as e:
+        print(f"ERROR loading JSON: {e}")
+        return []
+
 class MarketDataService:
     """
     Market data service for multi-asset support.
@@ -113,6 +147,18 @@ class MarketDataService:
     def __init__(self):
         self._cache = {}
         self._cache_ttl = 60  # Cache for 60 seconds
+        self._nifty_db: Optional[list] = None  # Loaded on first search
+        self._nifty_index: list = []
+    
+    def _cache_get(self, key: tuple) -> Optional[Any]:
+        """Cached value for key if still within the TTL, else None"""
+        entry = self._cache.get(key)
+        if entry and time.monotonic() - entry[0] < self._cache_ttl:
+            return entry[1]
+        return None
+    
+    def _cache_set(self, key: tuple, value: Any):
+        self._cache[key] = (time.monotonic(), value)
     
     async def get_price(self, symbol: str) -> dict:
         """
@@ -124,8 +170,16 @@ class MarketDataService:
         Returns:
             Price data dict
         """
+        cached = self._cache_get(("price", symbol))
+        if cached is not None:
+            return cached
+        
         loop = asyncio.get_event_loop()
         result = await loop.run_in_executor(_executor, _fetch_ticker_info, symbol)
+        
+        # Only cache successful lookups so failures are retried next call
+        if result.get("success"):
+            self._cache_set(("price", symbol), result)
         return result
     
     async def get_prices(self, symbols: list[str]) -> dict:
@@ -167,6 +221,10 @@ class MarketDataService:
             "DOWN" if price decreased > 0.5%
             "FLAT" otherwise
         """
+        cached = self._cache_get(("trend", symbol))
+        if cached is not None:
+            return cached
+        
         history = await self.get_history(symbol, period="1d", interval="1h")
         
         if len(history) < 2:
@@ -182,11 +240,14 @@ class MarketDataService:
         change_percent = ((curr_close - prev_close) / prev_close) * 100
         
         if change_percent > 0.5:
-            return "UP"
+            trend = "UP"
         elif change_percent < -0.5:
-            return "DOWN"
+            trend = "DOWN"
         else:
-            return "FLAT"
+            trend = "FLAT"
+        
+        self._cache_set(("trend", symbol), trend)
+        return trend
     
     async def get_volatility(self, symbol: str) -> float:
         """
@@ -195,6 +256,10 @@ class MarketDataService:
         Returns:
             Volatility as percentage (e.g., 2.5 for 2.5%)
         """
+        cached = self._cache_get(("volatility", symbol))
+        if cached is not None:
+            return cached
+        
         history = await self.get_history(symbol, period="5d", interval="1h")
         
         if len(history) < 10:
@@ -215,9 +280,10 @@ class MarketDataService:
         # Standard deviation of returns
         mean = sum(returns) / len(returns)
         variance = sum((r - mean) ** 2 for r in returns) / len(returns)
-        volatility = variance ** 0.5
+        volatility = round(variance ** 0.5, 2)
         
-        return round(volatility, 2)
+        self._cache_set(("volatility", symbol), volatility)
+        return volatility
     
     def search_assets(self, query: str) -> list:
         """
@@ -226,40 +292,30 @@ class MarketDataService:
         query_upper = query.upper()
         results = []
         
-        # 1. Load Static Database (Lazy Load) - Simplified
-        if not hasattr(self, '_nifty_db'):
-            import json
-            import os
-            try:
-                # Resolve path relative to this file
-                base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                json_path = os.path.join(base_dir, "data", "nifty_500.json")
-                
-                with open(json_path, "r", encoding='utf-8') as f:
-                    self._nifty_db = json.load(f)
-                print(f"Loaded {len(self._nifty_db)} stocks from database")
-            except Exception as e:
-                print(f"ERROR loading JSON: {e}")
-                self._nifty_db = []
+        # 1. Load Static Database (Lazy Load, once)
+        if self._nifty_db is None:
+            self._nifty_db = _load_nifty()
+
+            # Pre-uppercase the searchable text once so each query is a plain substring scan
+            self._nifty_index = [
+                (f"{item['symbol']}\n{item['name'].upper()}", item)
+                for item in self._nifty_db
+                if 'symbol' in item and 'name' in item
+            ]
 
         # 2. Filter Static DB
-        if self._nifty_db:
-            for item in self._nifty_db:
-                try:
-                    if query_upper in item['symbol'] or query_upper in item['name'].upper():
-                        results.append({
-                            "symbol": item['symbol'],
-                            "name": item['name'],
-                            "type": "STOCK",
-                            "exchange": "NSE",
-                            "price": "Live Check",
-                            "currency": "INR"
-                        })
-                        if len(results) >= 10: 
-                            break
-                except Exception as e:
-                    print(f"Error processing item: {e}")
-                    continue
+        for key, item in self._nifty_index:
+            if query_upper in key:
+                results.append({
+                    "symbol": item['symbol'],
+                    "name": item['name'],
+                    "type": "STOCK",
+                    "exchange": "NSE",
+                    "price": "Live Check",
+                    "currency": "INR"
+                })
+                if len(results) >= 10: 
+                    break
 
         # 3. If no static results, allow custom ticker
         if not results:
@@ -101,9 +101,9 @@ class MockDataStreamer:
         # Lazy import to not block startup
         from app.services.finbert_service import finbert_service
         
-        # Run FinBERT analysis on all headlines
-        texts = [h.get("headline", "") for h in headlines]
-        sentiments = finbert_service.analyze_batch(texts)
+        # Run FinBERT analysis on all headlines (one batched forward pass, off the event loop)
+        loop = asyncio.get_event_loop()
+        sentiments = await loop.run_in_executor(None, finbert_service.analyze_dicts, headlines, "headline")
         
         # Apply Source Purity to each result
         analyzed = []
@@ -121,9 +121,9 @@ class MockDataStreamer:
                 "source": headline_data.get("source"),
                 "finbert_label": sentiment["label"],
                 "finbert_score": sentiment["score"],
-                "weighted_score": purity_result["weighted_score"],
-                "source_weight": purity_result["weight"],
-                "source_category": purity_result["source_category"],
+                "weighted_score": purity_result.weighted_score,
+                "source_weight": purity_result.weight,
+                "source_category": purity_result.source_category,
             })
         
         # Aggregate by asset
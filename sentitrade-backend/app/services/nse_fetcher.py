@@ -4,35 +4,46 @@ Fetches real-time and historical data for NSE India stocks.
 
 Primary Source: Indian-Stock-Market-API (0xramm)
 Secondary Source: Direct NSE API
-Fallback: yfinance with .NS suffix
-Historical: nsepy for 180-day OHLC
+Fallback: Yahoo chart API with .NS suffix (async, shared session)
+Historical: Yahoo chart API for 180-day OHLC, nsepy as fallback
 
 STRICT: All prices formatted in en-IN locale (₹1,12,450.00)
 """
 
 import logging
 import asyncio
+import functools
+import time
+from types import MappingProxyType
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from concurrent.futures import ThreadPoolExecutor
 import aiohttp
+import orjson
+from cachetools import LRUCache
 
+try:
+    import ijson
+except ImportError:  # Optional: fall back to parsing the full body
+    ijson = None
+
+from app.config import settings
 from app.utils.decimal_guard import clean_data, format_inr, detect_asset_type, get_mock_price
 
 logger = logging.getLogger(__name__)
 
-# Thread pool for sync operations
+# Thread pool for sync operations (nsepy fallback, disk cache I/O)
 _executor = ThreadPoolExecutor(max_workers=4)
 
-# Browser-like headers for NSE direct API
-HEADERS = {
+# Browser-like headers for NSE direct API (read-only: shared by every session)
+HEADERS = MappingProxyType({
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
     'Accept': 'application/json',
     'Accept-Language': 'en-US,en;q=0.9',
     'Accept-Encoding': 'gzip, deflate, br',
     'Referer': 'https://www.nseindia.com/',
     'Connection': 'keep-alive',
-}
+})
 
 # 0xramm API Base URL (Indian-Stock-Market-API)
 XRAMM_API_BASE = "https://indian-stock-market-api.onrender.com"
@@ -40,6 +51,139 @@ XRAMM_API_BASE = "https://indian-stock-market-api.onrender.com"
 # NSE Direct API Base URL  
 NSE_BASE_URL = "https://www.nseindia.com/api"
 
+# Yahoo Finance chart API (what yfinance wraps), queried directly over aiohttp
+YAHOO_CHART_BASE = "https://query1.finance.yahoo.com/v8/finance/chart"
+
+NIFTY_INDEX_URL = f"{XRAMM_API_BASE}/api/v1/index/NIFTY%2050"
+SENSEX_INDEX_URL = f"{XRAMM_API_BASE}/api/v1/index/SENSEX"
+
+
+# Per-symbol URLs, memoised (the NSE symbol universe is small and finite)
+@functools.lru_cache(maxsize=4096)
+def _xramm_url(symbol: str) -> str:
+    return f"{XRAMM_API_BASE}/api/v1/equity/{symbol}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _nse_quote_url(symbol: str) -> str:
+    return f"{NSE_BASE_URL}/quote-equity?symbol={symbol}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _yahoo_chart_url(symbol: str) -> str:
+    return f"{YAHOO_CHART_BASE}/{symbol}.NS"
+
+# On-disk history cache, opened lazily (False = unavailable)
+_hist_cache = None
+
+
+def _get_hist_cache():
+    """Open the diskcache store on first use; None if diskcache isn't usable."""
+    global _hist_cache
+    if _hist_cache is None:
+        try:
+            from diskcache import Cache
+            _hist_cache = Cache(settings.history_cache_dir)
+        except Exception as e:
+            logger.warning(f"History disk cache disabled: {e}")
+            _hist_cache = False
+    return _hist_cache or None
+
+# Fields read from NSE's (large) quote-equity response
+NSE_QUOTE_FIELDS = frozenset({
+    'info.companyName',
+    'priceInfo.lastPrice',
+    'priceInfo.pChange',
+    'priceInfo.totalTradedVolume',
+})
+
+
+async def _parse_fields(response: aiohttp.ClientResponse, prefixes: frozenset) -> Dict[str, Any]:
+    """
+    Pull only the given dotted JSON paths out of a response body.
+    
+    The body is always read in full, so aiohttp can hand the connection
+    back to the keep-alive pool; ijson then stops parsing once every path
+    has been seen, instead of building the whole document.
+    """
+    body = await response.read()
+    if ijson is None:
+        data = orjson.loads(body)
+        out = {}
+        for prefix in prefixes:
+            value = data
+            for key in prefix.split('.'):
+                value = value.get(key) if isinstance(value, dict) else None
+            if value is not None:
+                out[prefix] = value
+        return out
+    
+    out = {}
+    for prefix, event, value in ijson.parse(body, use_float=True):
+        if prefix in prefixes and event in ('number', 'string', 'boolean'):
+            out[prefix] = value
+            if len(out) == len(prefixes):
+                break
+    return out
+
+# Seconds to wait on 0xramm before also asking NSE Direct (hedged request)
+HEDGE_DELAY = 0.5
+
+
+def _df_to_candles(df, volume_col: str) -> List[dict]:
+    """
+    Convert an OHLCV DataFrame to lightweight-charts candles column-wise
+    (avoids iterrows, which boxes every row into a Series).
+    """
+    import pandas as pd
+    
+    times = pd.DatetimeIndex(df.index).strftime('%Y-%m-%d').tolist()
+    if volume_col in df.columns:
+        volumes = df[volume_col].fillna(0).astype('int64').tolist()
+    else:
+        volumes = [0] * len(df)
+    
+    return [
+        {
+            'time': t,
+            'open': clean_data(o),
+            'high': clean_data(h),
+            'low': clean_data(l),
+            'close': clean_data(c),
+            'volume': v,
+        }
+        for t, o, h, l, c, v in zip(
+            times,
+            df['Open'].tolist(),
+            df['High'].tolist(),
+            df['Low'].tolist(),
+            df['Close'].tolist(),
+            volumes,
+        )
+    ]
+
+
+def _sync_nsepy_history(symbol: str, start_date: datetime, end_date: datetime) -> List[dict]:
+    """Blocking nsepy history fetch (runs in the thread pool)."""
+    try:
+        from nsepy import get_history as nsepy_get_history
+        
+        df = nsepy_get_history(
+            symbol=symbol,
+            start=start_date.date(),
+            end=end_date.date()
+        )
+        
+        if df is not None and not df.empty:
+            volume_col = 'Volume' if 'Volume' in df.columns else 'Traded Volume'
+            candles = _df_to_candles(df, volume_col)
+            logger.info(f"✅ [nsepy] Got {len(candles)} candles for {symbol}")
+            return candles
+    except Exception as e:
+        logger.warning(f"[nsepy] Failed for {symbol}: {e}")
+    
+    return []
+
 
 class NSEFetcher:
     """
@@ -48,25 +192,55 @@ class NSEFetcher:
     Priority:
     1. 0xramm Indian-Stock-Market-API (primary)
     2. NSE Direct API (secondary)
-    3. yfinance (fallback)
+    3. Yahoo chart API (fallback)
     4. Mock data (emergency)
     """
     
     def __init__(self):
         self._session: Optional[aiohttp.ClientSession] = None
         self._cookies_set = False
-        self._last_prices: Dict[str, dict] = {}
+        # Bounded so a long-running server covering the full NSE universe doesn't grow forever
+        self._last_prices: Dict[str, dict] = LRUCache(maxsize=512)
+        # TTL caches: key -> (monotonic fetch time, value)
+        self._quote_cache: Dict[str, tuple] = LRUCache(maxsize=512)
+        self._indices_cache: Optional[tuple] = None
+        self._history_cache: Dict[tuple, tuple] = LRUCache(maxsize=128)
+        # Single-flight registry: symbol -> in-progress fetch shared by concurrent callers
+        self._inflight: Dict[str, asyncio.Future] = {}
         
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session."""
         if self._session is None or self._session.closed:
             timeout = aiohttp.ClientTimeout(total=10)
+            # Keep connections (and their TLS sessions) alive across quotes
+            connector = aiohttp.TCPConnector(
+                limit=50,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True,
+            )
             self._session = aiohttp.ClientSession(
                 timeout=timeout,
-                headers=HEADERS
+                headers=HEADERS,
+                connector=connector
             )
         return self._session
     
+    async def warmup(self):
+        """Open pooled connections to the upstream hosts so the first quote skips the handshake."""
+        session = await self._get_session()
+        
+        async def _head(url: str):
+            try:
+                async with session.head(url) as resp:
+                    if url.startswith("https://www.nseindia.com"):
+                        self._cookies_set = True
+            except Exception as e:
+                logger.debug(f"[warmup] {url} unreachable: {e}")
+        
+        await asyncio.gather(_head(XRAMM_API_BASE), _head("https://www.nseindia.com"))
+    
     async def get_quote(self, symbol: str) -> dict:
         """
         Get real-time quote for an NSE stock.
@@ -80,34 +254,81 @@ class NSEFetcher:
         # Normalize symbol (remove .NS suffix if present)
         clean_symbol = symbol.upper().replace('.NS', '').replace('.BO', '').strip()
         
+        # Serve repeated requests for the same symbol from the short-lived cache
+        now = time.monotonic()
+        entry = self._quote_cache.get(clean_symbol)
+        if entry and now - entry[0] < settings.nse_quote_ttl_seconds:
+            return entry[1]
+        
+        # Coalesce concurrent requests for the same symbol into one upstream fetch
+        fut = self._inflight.get(clean_symbol)
+        if fut is None:
+            fut = asyncio.ensure_future(self._fetch_quote_chain(clean_symbol, now))
+            self._inflight[clean_symbol] = fut
+            fut.add_done_callback(lambda _: self._inflight.pop(clean_symbol, None))
+        
+        # Shield so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(fut)
+    
+    async def _fetch_quote_chain(self, clean_symbol: str, now: float) -> dict:
+        """Run the multi-source fallback chain for a normalized symbol."""
         # Try sources in priority order
         result = None
         
-        # 1. Try 0xramm API (primary)
-        result = await self._fetch_xramm_quote(clean_symbol)
-        if result and result.get('price', 0) > 0:
-            logger.info(f"✅ [0xramm] Got price for {clean_symbol}: ₹{result['price']}")
-            self._last_prices[clean_symbol] = result
-            return result
-        
-        # 2. Try NSE Direct API (secondary)
-        result = await self._fetch_nse_direct(clean_symbol)
-        if result and result.get('price', 0) > 0:
-            logger.info(f"✅ [NSE Direct] Got price for {clean_symbol}: ₹{result['price']}")
+        # 1-2. Try 0xramm API (primary), hedged with NSE Direct API (secondary)
+        result = await self._fetch_hedged_quote(clean_symbol)
+        if result:
+            logger.info(f"✅ [{result['source']}] Got price for {clean_symbol}: ₹{result['price']}")
             self._last_prices[clean_symbol] = result
+            self._quote_cache[clean_symbol] = (now, result)
             return result
         
-        # 3. Try yfinance (fallback)
-        result = await self._fetch_yfinance_quote(clean_symbol)
+        # 3. Try Yahoo chart API (fallback)
+        result = await self._fetch_yahoo_quote(clean_symbol)
         if result and result.get('price', 0) > 0:
-            logger.info(f"✅ [yfinance] Got price for {clean_symbol}: ₹{result['price']}")
+            logger.info(f"✅ [yahoo] Got price for {clean_symbol}: ₹{result['price']}")
             self._last_prices[clean_symbol] = result
+            self._quote_cache[clean_symbol] = (now, result)
             return result
         
         # 4. Return cached or mock data (emergency)
         logger.warning(f"⚠️ All sources failed for {clean_symbol}, using fallback")
         return self._get_fallback(clean_symbol)
     
+    async def _fetch_hedged_quote(self, symbol: str) -> Optional[dict]:
+        """
+        Race 0xramm against NSE Direct and return the first valid quote.
+        
+        NSE Direct is only started if 0xramm hasn't answered within HEDGE_DELAY,
+        so the happy path still costs a single upstream request.
+        """
+        def _valid(quote: Optional[dict]) -> bool:
+            return bool(quote) and quote.get('price', 0) > 0
+        
+        primary = asyncio.create_task(self._fetch_xramm_quote(symbol))
+        done, _ = await asyncio.wait({primary}, timeout=HEDGE_DELAY)
+        if done:
+            result = primary.result()
+            if _valid(result):
+                return result
+            # Primary failed fast - no race needed, just try the secondary
+            result = await self._fetch_nse_direct(symbol)
+            return result if _valid(result) else None
+        
+        secondary = asyncio.create_task(self._fetch_nse_direct(symbol))
+        pending = {primary, secondary}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary source if both finished together
+                for task in (primary, secondary):
+                    if task in done and _valid(task.result()):
+                        return task.result()
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+    
     async def _fetch_xramm_quote(self, symbol: str) -> Optional[dict]:
         """
         Fetch from 0xramm Indian-Stock-Market-API.
@@ -116,13 +337,13 @@ class NSEFetcher:
         """
         try:
             session = await self._get_session()
-            url = f"{XRAMM_API_BASE}/api/v1/equity/{symbol}"
+            url = _xramm_url(symbol)
             
             async with session.get(url) as response:
                 if response.status != 200:
                     return None
                     
-                data = await response.json()
+                data = orjson.loads(await response.read())
                 
                 # Extract price from API response
                 price = data.get('lastPrice') or data.get('price') or data.get('lastTradedPrice', 0)
@@ -163,17 +384,16 @@ class NSEFetcher:
                     pass
             
             # Fetch quote
-            url = f"{NSE_BASE_URL}/quote-equity?symbol={symbol}"
+            url = _nse_quote_url(symbol)
             
             async with session.get(url) as response:
                 if response.status != 200:
                     return None
                     
-                data = await response.json()
-                price_info = data.get('priceInfo', {})
+                fields = await _parse_fields(response, NSE_QUOTE_FIELDS)
                 
-                price = price_info.get('lastPrice', 0)
-                change_pc = price_info.get('pChange', 0)
+                price = fields.get('priceInfo.lastPrice', 0)
+                change_pc = fields.get('priceInfo.pChange', 0)
                 
                 return {
                     'asset': f"{symbol}.NS",
@@ -184,47 +404,88 @@ class NSEFetcher:
                     'source': 'NSE_DIRECT',
                     'is_mock': False,
                     'sentiment': 0.50,
-                    'name': data.get('info', {}).get('companyName', symbol),
-                    'volume': price_info.get('totalTradedVolume', 0),
+                    'name': fields.get('info.companyName', symbol),
+                    'volume': fields.get('priceInfo.totalTradedVolume', 0),
                     'timestamp': datetime.now().isoformat()
                 }
         except Exception as e:
             logger.debug(f"[NSE Direct] Failed for {symbol}: {e}")
             return None
     
-    async def _fetch_yfinance_quote(self, symbol: str) -> Optional[dict]:
-        """Fetch from yfinance as fallback."""
+    async def _fetch_yahoo_chart(self, symbol: str, params: Dict[str, Any]) -> Optional[dict]:
+        """
+        Query Yahoo's v8 chart endpoint for an NSE symbol over the shared session.
+        
+        Returns chart.result[0] (meta + timestamp + indicators) or None.
+        """
+        session = await self._get_session()
+        async with session.get(_yahoo_chart_url(symbol), params=params) as response:
+            if response.status != 200:
+                return None
+            data = orjson.loads(await response.read())
+        
+        results = (data.get('chart') or {}).get('result') or []
+        return results[0] if results else None
+    
+    async def _fetch_yahoo_quote(self, symbol: str) -> Optional[dict]:
+        """Fetch from Yahoo's chart API as fallback."""
         try:
-            loop = asyncio.get_event_loop()
+            chart = await self._fetch_yahoo_chart(symbol, {'range': '1d', 'interval': '1d'})
+            if not chart:
+                return None
             
-            def _sync_fetch():
-                import yfinance as yf
-                ticker = yf.Ticker(f"{symbol}.NS")
-                info = ticker.info
-                
-                price = info.get('regularMarketPrice') or info.get('previousClose', 0)
-                change_pc = info.get('regularMarketChangePercent', 0)
-                
-                return {
-                    'asset': f"{symbol}.NS",
-                    'price': clean_data(price),
-                    'change_pc': clean_data(change_pc),
-                    'type': 'NSE',
-                    'currency': 'INR',
-                    'source': 'yfinance',
-                    'is_mock': False,
-                    'sentiment': 0.50,
-                    'name': info.get('shortName', symbol),
-                    'volume': info.get('regularMarketVolume', 0),
-                    'timestamp': datetime.now().isoformat()
-                }
+            meta = chart.get('meta', {})
+            price = meta.get('regularMarketPrice') or meta.get('chartPreviousClose', 0)
+            prev_close = meta.get('chartPreviousClose') or meta.get('previousClose')
+            change_pc = (price - prev_close) / prev_close * 100 if price and prev_close else 0
             
-            result = await loop.run_in_executor(_executor, _sync_fetch)
-            return result
+            return {
+                'asset': f"{symbol}.NS",
+                'price': clean_data(price),
+                'change_pc': clean_data(change_pc),
+                'type': 'NSE',
+                'currency': 'INR',
+                'source': 'yahoo',
+                'is_mock': False,
+                'sentiment': 0.50,
+                'name': meta.get('shortName') or meta.get('longName') or symbol,
+                'volume': meta.get('regularMarketVolume', 0),
+                'timestamp': datetime.now().isoformat()
+            }
         except Exception as e:
-            logger.debug(f"[yfinance] Failed for {symbol}: {e}")
+            logger.debug(f"[yahoo] Failed for {symbol}: {e}")
             return None
     
+    async def _fetch_yahoo_history(self, symbol: str, start_date: datetime, end_date: datetime) -> List[dict]:
+        """Daily candles from Yahoo's chart API (rows with missing prices are skipped)."""
+        chart = await self._fetch_yahoo_chart(symbol, {
+            'period1': int(start_date.timestamp()),
+            'period2': int(end_date.timestamp()),
+            'interval': '1d',
+        })
+        if not chart or not chart.get('timestamp'):
+            return []
+        
+        # Bars are stamped in UTC; shift by the exchange offset so dates are IST trading days
+        offset = chart.get('meta', {}).get('gmtoffset', 19800)
+        quote = chart['indicators']['quote'][0]
+        
+        candles = []
+        for ts, o, h, l, c, v in zip(
+            chart['timestamp'], quote['open'], quote['high'], quote['low'], quote['close'], quote['volume']
+        ):
+            if o is None or h is None or l is None or c is None:
+                continue
+            candles.append({
+                'time': datetime.fromtimestamp(ts + offset, tz=timezone.utc).strftime('%Y-%m-%d'),
+                'open': clean_data(o),
+                'high': clean_data(h),
+                'low': clean_data(l),
+                'close': clean_data(c),
+                'volume': int(v or 0),
+            })
+        return candles
+    
     def _get_fallback(self, symbol: str) -> dict:
         """Return cached or mock data."""
         # Try cached data first
@@ -240,8 +501,8 @@ class NSEFetcher:
         """
         Fetch historical OHLC data for backtesting.
         
-        Uses nsepy for reliable NSE historical data.
-        Fallback to yfinance if nsepy fails.
+        Uses Yahoo's chart API over the shared aiohttp session.
+        Fallback to nsepy (blocking, run in the thread pool) if that fails.
         
         Args:
             symbol: Stock symbol
@@ -253,83 +514,67 @@ class NSEFetcher:
         """
         clean_symbol = symbol.upper().replace('.NS', '').replace('.BO', '').strip()
         
+        # Daily history barely changes intraday; reuse it for the TTL window
+        cache_key = (clean_symbol, days)
+        now = time.monotonic()
+        entry = self._history_cache.get(cache_key)
+        if entry and now - entry[0] < settings.nse_history_ttl_seconds:
+            return entry[1]
+        
         loop = asyncio.get_event_loop()
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
         
-        def _sync_fetch_history():
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            
-            # Try nsepy first (reliable for NSE data)
-            try:
-                from nsepy import get_history as nsepy_get_history
-                
-                df = nsepy_get_history(
-                    symbol=clean_symbol,
-                    start=start_date.date(),
-                    end=end_date.date()
-                )
-                
-                if df is not None and not df.empty:
-                    candles = []
-                    for idx, row in df.iterrows():
-                        candles.append({
-                            'time': idx.strftime('%Y-%m-%d'),
-                            'open': clean_data(row['Open']),
-                            'high': clean_data(row['High']),
-                            'low': clean_data(row['Low']),
-                            'close': clean_data(row['Close']),
-                            'volume': int(row.get('Volume', row.get('Traded Volume', 0))),
-                        })
-                    logger.info(f"✅ [nsepy] Got {len(candles)} candles for {clean_symbol}")
-                    return candles
-            except Exception as e:
-                logger.warning(f"[nsepy] Failed for {clean_symbol}: {e}")
-            
-            # Fallback to yfinance
-            try:
-                import yfinance as yf
-                
-                ticker = yf.Ticker(f"{clean_symbol}.NS")
-                df = ticker.history(period=f"{days}d")
-                
-                if df is not None and not df.empty:
-                    candles = []
-                    for idx, row in df.iterrows():
-                        candles.append({
-                            'time': idx.strftime('%Y-%m-%d'),
-                            'open': clean_data(row['Open']),
-                            'high': clean_data(row['High']),
-                            'low': clean_data(row['Low']),
-                            'close': clean_data(row['Close']),
-                            'volume': int(row['Volume']),
-                        })
-                    logger.info(f"✅ [yfinance] Got {len(candles)} candles for {clean_symbol}")
-                    return candles
-            except Exception as e:
-                logger.warning(f"[yfinance history] Failed for {clean_symbol}: {e}")
-            
-            return []
+        # Daily candles are static for the trading day - check the disk cache first
+        disk_cache = _get_hist_cache()
+        disk_key = f"{clean_symbol}:{days}:{end_date:%Y-%m-%d}"
+        if disk_cache is not None:
+            cached = await loop.run_in_executor(_executor, disk_cache.get, disk_key)
+            if cached:
+                self._history_cache[cache_key] = (now, cached)
+                return cached
+        
+        # 1. Yahoo chart API (async, no thread hop)
+        try:
+            candles = await self._fetch_yahoo_history(clean_symbol, start_date, end_date)
+            if candles:
+                logger.info(f"✅ [yahoo] Got {len(candles)} candles for {clean_symbol}")
+        except Exception as e:
+            logger.warning(f"[yahoo history] Failed for {clean_symbol}: {e}")
+            candles = []
+        
+        # 2. nsepy (explicit fallback)
+        if not candles:
+            candles = await loop.run_in_executor(
+                _executor, _sync_nsepy_history, clean_symbol, start_date, end_date
+            )
         
-        result = await loop.run_in_executor(_executor, _sync_fetch_history)
-        return result
+        if candles:
+            if disk_cache is not None:
+                await loop.run_in_executor(
+                    _executor, functools.partial(disk_cache.set, disk_key, candles, expire=86400)
+                )
+            self._history_cache[cache_key] = (now, candles)
+        return candles
     
     async def get_indices(self) -> dict:
         """
         Fetch NIFTY 50 and SENSEX index values.
         """
+        now = time.monotonic()
+        if self._indices_cache and now - self._indices_cache[0] < settings.nse_indices_ttl_seconds:
+            return self._indices_cache[1]
+        
         try:
             session = await self._get_session()
             
             # Try 0xramm API for indices
-            nifty_url = f"{XRAMM_API_BASE}/api/v1/index/NIFTY%2050"
-            sensex_url = f"{XRAMM_API_BASE}/api/v1/index/SENSEX"
-            
             result = {'NIFTY50': None, 'SENSEX': None}
             
             try:
-                async with session.get(nifty_url) as resp:
+                async with session.get(NIFTY_INDEX_URL) as resp:
                     if resp.status == 200:
-                        data = await resp.json()
+                        data = orjson.loads(await resp.read())
                         result['NIFTY50'] = {
                             'value': clean_data(data.get('last', 0)),
                             'change_pc': clean_data(data.get('pChange', 0))
@@ -338,9 +583,9 @@ class NSEFetcher:
                 pass
             
             try:
-                async with session.get(sensex_url) as resp:
+                async with session.get(SENSEX_INDEX_URL) as resp:
                     if resp.status == 200:
-                        data = await resp.json()
+                        data = orjson.loads(await resp.read())
                         result['SENSEX'] = {
                             'value': clean_data(data.get('last', 0)),
                             'change_pc': clean_data(data.get('pChange', 0))
@@ -348,6 +593,8 @@ class NSEFetcher:
             except:
                 pass
             
+            if result['NIFTY50'] or result['SENSEX']:
+                self._indices_cache = (now, result)
             return result
         except Exception as e:
             logger.error(f"Failed to fetch indices: {e}")
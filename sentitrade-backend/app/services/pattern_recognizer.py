@@ -1,7 +1,8 @@
 import math
 import logging
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from collections import deque
+from typing import Deque, List, Dict, Optional
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +13,116 @@ class MarketPattern:
     description: str
     action: str # BUY, SELL, HOLD, ALERT
 
+@dataclass
+class AssetWindow:
+    """
+    Rolling price/sentiment window with running sums.
+    Appending is O(1); the Pearson coefficient and the price trend slope are closed-form evaluations.
+    """
+    size: int
+    prices: Deque[float] = field(init=False)
+    sentiments: Deque[float] = field(init=False)
+    sum_x: float = 0.0
+    sum_y: float = 0.0
+    sum_xx: float = 0.0
+    sum_yy: float = 0.0
+    sum_xy: float = 0.0
+    sum_ix: float = 0.0  # Σ i·price_i, i = position in window (0 = oldest)
+    _updates: int = 0
+    _corr: Optional[float] = None  # Memoised correlation, cleared on every append
+
+    def __post_init__(self):
+        self.prices = deque(maxlen=self.size)
+        self.sentiments = deque(maxlen=self.size)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def append(self, price: float, sentiment: float):
+        self._corr = None
+        n = len(self.prices)
+        if n == self.size:
+            # Window is full: retract the sample the deque is about to evict
+            old_x, old_y = self.prices[0], self.sentiments[0]
+            # Every survivor's position drops by one, taking Σ(survivor prices) off Σ i·price_i
+            self.sum_ix -= self.sum_x - old_x
+            n -= 1
+            self.sum_x -= old_x
+            self.sum_y -= old_y
+            self.sum_xx -= old_x * old_x
+            self.sum_yy -= old_y * old_y
+            self.sum_xy -= old_x * old_y
+
+        self.prices.append(price)
+        self.sentiments.append(sentiment)
+        self.sum_x += price
+        self.sum_y += sentiment
+        self.sum_xx += price * price
+        self.sum_yy += sentiment * sentiment
+        self.sum_xy += price * sentiment
+        self.sum_ix += n * price
+
+        # Rebuild the sums once per window to stop add/subtract drift accumulating
+        self._updates += 1
+        if self._updates % self.size == 0:
+            self._resync()
+
+    def _resync(self):
+        xs, ys = self.prices, self.sentiments
+        self.sum_x = math.fsum(xs)
+        self.sum_y = math.fsum(ys)
+        self.sum_xx = math.fsum(x * x for x in xs)
+        self.sum_yy = math.fsum(y * y for y in ys)
+        self.sum_xy = math.fsum(x * y for x, y in zip(xs, ys))
+        self.sum_ix = math.fsum(i * x for i, x in enumerate(xs))
+
+    def correlation(self) -> float:
+        """Pearson coefficient from the running sums (0.0 when undefined)"""
+        if self._corr is None:
+            self._corr = self._correlation()
+        return self._corr
+
+    def _correlation(self) -> float:
+        n = len(self.prices)
+        if n == 0:
+            return 0.0
+
+        var_x = n * self.sum_xx - self.sum_x * self.sum_x
+        var_y = n * self.sum_yy - self.sum_y * self.sum_y
+        # The running-sum form cancels badly when the spread is tiny next to the level
+        # (e.g. BTC at 98000 ± 0.05); recompute those windows from the samples
+        if var_x <= 1e-6 * n * self.sum_xx or var_y <= 1e-6 * n * self.sum_yy:
+            return self._correlation_two_pass()
+
+        cov = n * self.sum_xy - self.sum_x * self.sum_y
+        return max(-1.0, min(1.0, cov / math.sqrt(var_x * var_y)))
+
+    def _correlation_two_pass(self) -> float:
+        """Pearson coefficient from deviations about the mean (0.0 for a flat series)"""
+        xs, ys = self.prices, self.sentiments
+        if min(xs) == max(xs) or min(ys) == max(ys):
+            return 0.0
+
+        n = len(xs)
+        mean_x = math.fsum(xs) / n
+        mean_y = math.fsum(ys) / n
+        dx = [x - mean_x for x in xs]
+        dy = [y - mean_y for y in ys]
+        var_x = math.fsum(d * d for d in dx)
+        var_y = math.fsum(d * d for d in dy)
+        if var_x == 0.0 or var_y == 0.0:
+            return 0.0
+
+        cov = math.fsum(a * b for a, b in zip(dx, dy))
+        return max(-1.0, min(1.0, cov / math.sqrt(var_x * var_y)))
+
+    def trend_up(self) -> bool:
+        """Least-squares slope of price against window position is positive"""
+        n = len(self.prices)
+        # Slope numerator n·Σi·p − Σi·Σp with Σi = n(n-1)/2; the denominator is always > 0
+        num = n * self.sum_ix - (n * (n - 1) / 2) * self.sum_x
+        return num > 1e-12 * n * abs(self.sum_ix)
+
 class PatternRecognizer:
     """
     Advanced Quantitative Analysis Engine.
@@ -20,22 +131,17 @@ class PatternRecognizer:
     
     def __init__(self):
         # Rolling window history for correlation (last 50 data points)
-        # Structure: { "BTC-USD": { "prices": [], "sentiments": [] } }
-        self._history: Dict[str, Dict[str, List[float]]] = {}
+        # Structure: { "BTC-USD": AssetWindow }
+        self._history: Dict[str, AssetWindow] = {}
         self._window_size = 50
 
     def update_data(self, asset: str, price: float, sentiment: float):
         """Ingest new data point for an asset"""
-        if asset not in self._history:
-            self._history[asset] = {"prices": [], "sentiments": []}
+        window = self._history.get(asset)
+        if window is None:
+            window = self._history[asset] = AssetWindow(self._window_size)
             
-        self._history[asset]["prices"].append(price)
-        self._history[asset]["sentiments"].append(sentiment)
-        
-        # Trim to window size
-        if len(self._history[asset]["prices"]) > self._window_size:
-            self._history[asset]["prices"].pop(0)
-            self._history[asset]["sentiments"].pop(0)
+        window.append(price, sentiment)
 
     def calculate_correlation(self, asset: str) -> float:
         """
@@ -44,12 +150,12 @@ class PatternRecognizer:
         0: No correlation
         1: Perfect positive correlation
         """
-        data = self._history.get(asset)
-        if not data or len(data["prices"]) < 10:
+        window = self._history.get(asset)
+        if not window or len(window) < 10:
             return 0.0
             
         try:
-            return self._pearson_correlation(data["prices"], data["sentiments"])
+            return window.correlation()
         except Exception as e:
             logger.error(f"Correlation calc error: {e}")
             return 0.0
@@ -58,12 +164,26 @@ class PatternRecognizer:
         """
         Identify sophisticated trading setups based on data confluence.
         """
+        window = self._history.get(asset)
+        trend_up = self._is_trend_up(window) if window else False
+
+        # Neutral sentiment without an uptrend can't match any setup below (the common tick)
+        if 20 <= current_sentiment <= 80 and not trend_up:
+            return []
+
         patterns = []
-        correlation = self.calculate_correlation(asset)
+
+        # Pearson is only needed by the sentiment-extreme / divergence checks, so compute on demand
+        _c = None
+        def _corr() -> float:
+            nonlocal _c
+            if _c is None:
+                _c = self.calculate_correlation(asset)
+            return _c
         
         # 1. Hype Squeeze (Price UP, Sentiment Sky High, Volatility Low -> High)
         # Danger of a "sell the news" event
-        if current_sentiment > 80 and correlation > 0.8:
+        if current_sentiment > 80 and _corr() > 0.8:
             patterns.append(MarketPattern(
                 name="Euphorical Top",
                 confidence=0.85,
@@ -73,7 +193,7 @@ class PatternRecognizer:
 
         # 2. Silent Accumulation (Price Rising, Sentiment Neutral/Low)
         # Smart money buying without retail hype
-        if self._is_trend_up(self._history[asset]["prices"]) and current_sentiment < 55 and current_sentiment > 45:
+        if trend_up and current_sentiment < 55 and current_sentiment > 45:
              patterns.append(MarketPattern(
                 name="Silent Accumulation",
                 confidence=0.75,
@@ -93,7 +213,7 @@ class PatternRecognizer:
 
         # 4. Bearish Divergence (Price UP, Sentiment DOWN)
         # The classic "Trap"
-        if correlation < -0.6 and self._is_trend_up(self._history[asset]["prices"]):
+        if trend_up and _corr() < -0.6:
              patterns.append(MarketPattern(
                 name="Bearish Divergence",
                 confidence=0.9,
@@ -103,31 +223,10 @@ class PatternRecognizer:
 
         return patterns
 
-    def _pearson_correlation(self, x: List[float], y: List[float]) -> float:
-        """Pure Python Pearson Implementation (No numpy dep for zero-key edge)"""
-        n = len(x)
-        if n != len(y) or n == 0:
-            return 0.0
-            
-        mean_x = sum(x) / n
-        mean_y = sum(y) / n
-        
-        numerator = sum((xi - mean_x) * (yi - mean_y) for xi, yi in zip(x, y))
-        
-        sum_sq_diff_x = sum((xi - mean_x) ** 2 for xi in x)
-        sum_sq_diff_y = sum((yi - mean_y) ** 2 for yi in y)
-        
-        denominator = math.sqrt(sum_sq_diff_x * sum_sq_diff_y)
-        
-        if denominator == 0:
-            return 0.0
-            
-        return numerator / denominator
-        
-    def _is_trend_up(self, prices: List[float]) -> bool:
+    def _is_trend_up(self, window: AssetWindow) -> bool:
         """Simple linear regression slope check"""
-        if len(prices) < 5: return False
-        return prices[-1] > prices[0] # Very naive, but fast
+        if len(window) < 5: return False
+        return window.trend_up()
 
 # Singleton
 pattern_recognizer = PatternRecognizer()
@@ -1,43 +1,113 @@
+import asyncio
 import logging
 import random
+import re
+from typing import List
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Source/spam keywords that scale the weight (x0.5 / x1.5 each)
+_NEG_WEIGHT_KWS = frozenset(("100x", "giveaway", "telegram", "rugpull", "airdrop"))
+_POS_WEIGHT_KWS = frozenset(("reuters", "bloomberg", "ap news", "verified"))
+
+# Keyword -> (kind, value). "pos"/"neg" count towards the label, "mul" scales the weight.
+_KEYWORDS = {
+    **{kw: ("pos", 1) for kw in ["bullish", "amazing", "breaks", "strong", "resilience", "accumulates", "positive", "up", "moon", "pump"]},
+    **{kw: ("neg", 1) for kw in ["bearish", "crash", "dump", "sell", "fear", "panic", "down", "weak"]},
+    **{kw: ("mul", 0.5) for kw in _NEG_WEIGHT_KWS},
+    **{kw: ("mul", 1.5) for kw in _POS_WEIGHT_KWS},
+}
+
+# One scan finds every keyword: the lookahead tests each position without consuming,
+# so overlapping hits ("up" inside "pump") are all reported. Longest first at a position.
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(kw) for kw in sorted(_KEYWORDS, key=len, reverse=True)) + "))"
+)
+
+
+def _find_keywords(text_lower: str) -> set:
+    """Distinct keywords present in the (lowercased) text"""
+    return {m.group(1) for m in _KEYWORD_RE.finditer(text_lower)}
+
+# Batched mock scoring draws all its jitter in one call instead of 2 random.uniform()s per text
+_rng = np.random.default_rng()
+
+# label -> (base score, jitter span)
+_MOCK_BASE = {
+    "bullish": (65, 25),
+    "bearish": (25, 25),
+    "neutral": (45, 20),
+}
+
+
 class SentimentAnalyzer:
     """
     Mock FinBERT sentiment analyzer.
     In production, replace with actual FinBERT model loading.
     For hackathon, we use mock data for reliability.
+    Set use_finbert=True to route through the micro-batched FinBERT service.
     """
-    def __init__(self):
-        logger.info("✅ SentimentAnalyzer initialized (mock mode)")
+    def __init__(self, use_finbert: bool = False):
+        self.use_finbert = use_finbert
+        mode = "FinBERT" if use_finbert else "mock"
+        logger.info(f"✅ SentimentAnalyzer initialized ({mode} mode)")
+    
+    async def analyze_texts(self, texts: List[str]) -> List[dict]:
+        """Analyze several texts; with FinBERT they share one forward pass"""
+        if self.use_finbert:
+            return list(await asyncio.gather(*(self.analyze_text(t) for t in texts)))
+        
+        # Mock path: one vectorised draw covers every text's jitter
+        jitter = _rng.random((len(texts), 2))
+        return [
+            self._mock_analyze(text, u_score, u_conf)
+            for text, (u_score, u_conf) in zip(texts, jitter.tolist())
+        ]
     
     async def analyze_text(self, text: str) -> dict:
-        """Analyze sentiment of text (mock implementation)"""
+        """Analyze sentiment of text (mock implementation unless use_finbert)"""
+        if self.use_finbert:
+            return await self._analyze_finbert(text)
+        
+        return self._mock_analyze(text, random.random(), random.random())
+    
+    def _mock_analyze(self, text: str, u_score: float, u_conf: float) -> dict:
+        """
+        Keyword-based mock sentiment.
+        
+        Args:
+            text: Text to score
+            u_score: Uniform [0, 1) draw for the score jitter
+            u_conf: Uniform [0, 1) draw for the confidence jitter
+        """
         try:
-            # Mock sentiment based on keywords
-            text_lower = text.lower()
+            # Mock sentiment based on keywords (single pass over the text)
+            found = _find_keywords(text.lower())
             
-            positive_keywords = ["bullish", "amazing", "breaks", "strong", "resilience", "accumulates", "positive", "up", "moon", "pump"]
-            negative_keywords = ["bearish", "crash", "dump", "sell", "fear", "panic", "down", "weak"]
-            
-            positive_count = sum(1 for kw in positive_keywords if kw in text_lower)
-            negative_count = sum(1 for kw in negative_keywords if kw in text_lower)
+            positive_count = 0
+            negative_count = 0
+            for kw in found:
+                kind = _KEYWORDS[kw][0]
+                if kind == "pos":
+                    positive_count += 1
+                elif kind == "neg":
+                    negative_count += 1
             
             if positive_count > negative_count:
-                base_score = 65 + random.uniform(0, 25)
                 label = "bullish"
             elif negative_count > positive_count:
-                base_score = 25 + random.uniform(0, 25)
                 label = "bearish"
             else:
-                base_score = 45 + random.uniform(0, 20)
                 label = "neutral"
             
-            confidence = 60 + random.uniform(0, 30)
+            base, span = _MOCK_BASE[label]
+            base_score = base + span * u_score
+            confidence = 60 + 30 * u_conf
             
             # Apply weight adjustments
-            weight = self._calculate_weight(text)
+            weight = self._weight_from_keywords(found)
             final_score = min(100, max(0, base_score * weight))
             
             return {
@@ -53,22 +123,26 @@ class SentimentAnalyzer:
                 "label": "neutral",
             }
     
+    async def _analyze_finbert(self, text: str) -> dict:
+        """FinBERT path, mapped onto this analyzer's result shape"""
+        from app.services.finbert_service import finbert_service
+        
+        result = await finbert_service.analyze_async(text)
+        label = {"positive": "bullish", "negative": "bearish"}.get(result["label"], "neutral")
+        return {
+            "score": result["score"],
+            "confidence": round(result["raw_score"] * 100, 2),
+            "label": label,
+        }
+    
     def _calculate_weight(self, text: str) -> float:
         """Apply keyword-based weighting"""
-        negative_keywords = ["100x", "giveaway", "telegram", "rugpull", "airdrop"]
-        positive_keywords = ["reuters", "bloomberg", "ap news", "verified"]
-        
-        weight = 1.0
-        text_lower = text.lower()
-        
-        for keyword in negative_keywords:
-            if keyword in text_lower:
-                weight *= 0.5
-        
-        for keyword in positive_keywords:
-            if keyword in text_lower:
-                weight *= 1.5
-        
+        return self._weight_from_keywords(_find_keywords(text.lower()))
+    
+    def _weight_from_keywords(self, found: set) -> float:
+        """Multiply the weight of every matched source/spam keyword"""
+        # The product is order-independent, so it reduces to two set intersections
+        weight = 0.5 ** len(found & _NEG_WEIGHT_KWS) * 1.5 ** len(found & _POS_WEIGHT_KWS)
         return max(0.1, min(2.0, weight))
 
 # Global instance
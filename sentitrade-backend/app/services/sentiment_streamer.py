@@ -4,10 +4,13 @@ Streams AI "thoughts" for the Senti-Quant Console
 """
 
 import asyncio
-import random
 import logging
+from collections import Counter, defaultdict, deque
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import Deque, Optional, Set
+
+import numpy as np
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from app.models.sentiment import Sentiment
@@ -21,6 +24,21 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Source-name substring -> dashboard bucket (checked in order; anything else is "discord")
+_SOURCE_CATEGORY = {"reuters": "news", "bloomberg": "news", "twitter": "twitter", "reddit": "reddit"}
+_SOURCE_BUCKETS = ("twitter", "reddit", "news", "discord")
+
+# Demo randomness (warm-up labels, simulated sentiment change) is drawn per batch
+_rng = np.random.default_rng()
+_FALLBACK_LABELS = ("neutral", "positive", "negative")
+
+
+@lru_cache(maxsize=256)
+def _source_bucket(source: str) -> str:
+    """Map a headline source onto its dashboard bucket"""
+    source_lower = source.lower()
+    return next((bucket for key, bucket in _SOURCE_CATEGORY.items() if key in source_lower), "discord")
+
 
 class EnhancedSentimentStreamer:
     """
@@ -36,22 +54,20 @@ class EnhancedSentimentStreamer:
         self.session_maker = session_maker
         self.ws_manager = ws_manager
         self._running = False
-        self._thoughts_log: List[dict] = []
+        self._thoughts_log: Deque[dict] = deque(maxlen=100)  # Keep last 100 thoughts
+        self._now_iso: Optional[str] = None  # Shared timestamp while an iteration runs
+        self._persist_tasks: Set[asyncio.Task] = set()  # In-flight DB writes (strong refs)
     
     def _log_thought(self, thought: str, level: str = "info", asset: Optional[str] = None):
         """Log an AI thought for the console"""
         entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._now_iso or datetime.utcnow().isoformat(),
             "thought": thought,
             "level": level,  # info, success, warning, error
             "asset": asset
         }
         self._thoughts_log.append(entry)
         
-        # Keep last 100 thoughts
-        if len(self._thoughts_log) > 100:
-            self._thoughts_log = self._thoughts_log[-100:]
-        
         return entry
     
     async def _broadcast_thought(self, thought: str, level: str = "info", asset: Optional[str] = None):
@@ -93,6 +109,15 @@ class EnhancedSentimentStreamer:
     
     async def _process_iteration(self, iteration: int):
         """Process one streaming iteration"""
+        # Stamp everything this iteration emits with one clock read
+        self._now_iso = datetime.utcnow().isoformat()
+        try:
+            await self._run_iteration(iteration)
+        finally:
+            self._now_iso = None
+    
+    async def _run_iteration(self, iteration: int):
+        """Analyze, persist and broadcast one batch of headlines"""
         
         # Get random headlines
         headlines = mock_streamer.get_random_headlines(count=5)
@@ -117,8 +142,9 @@ class EnhancedSentimentStreamer:
              # Fallback to mock analysis while loading
              await self._broadcast_thought("🧠 AI still warming up, using heuristic estimates...", "warning")
              # Add mock 'finbert_label' to headlines so the rest of the code works
-             for h in headlines:
-                 h["finbert_label"] = random.choice(["neutral", "positive", "negative"])
+             labels = _rng.choice(_FALLBACK_LABELS, size=len(headlines)).tolist()
+             for h, label in zip(headlines, labels):
+                 h["finbert_label"] = label
              
              # Create mock result structure
              result = {
@@ -129,11 +155,13 @@ class EnhancedSentimentStreamer:
                      "finbert_label": h["finbert_label"]
                  } for h in headlines],
                  "aggregate": {"aggregate_score": 50, "trusted_count": 0, "spam_count": 0},
-                 "by_asset": {asset: {"aggregate_score": 50} for asset in assets}
+                 "by_asset": {asset: {"aggregate_score": 50, "trusted_count": 0, "spam_count": 0} for asset in assets}
              }
         
         # Log individual analysis
-        for item in result.get("headlines_analyzed", [])[:3]:  # Show top 3
+        # Both branches above build the full result shape, so keys are indexed directly
+        headlines_analyzed = result["headlines_analyzed"]
+        for item in headlines_analyzed[:3]:  # Show top 3
             source_emoji = "🏛️" if item["source_category"] == "trusted" else ("⚠️" if item["source_category"] == "spam" else "📰")
             sentiment_emoji = "🟢" if item["finbert_label"] == "positive" else ("🔴" if item["finbert_label"] == "negative" else "⚪")
             
@@ -143,127 +171,161 @@ class EnhancedSentimentStreamer:
                 item["asset"]
             )
         
-        # Save to database and broadcast
-        async with self.session_maker() as session:
-            aggregate = result.get("aggregate", {})
-            
-            # Calculate source breakdown from headlines
-            sources = {"twitter": {"count": 0, "quality": 0}, "reddit": {"count": 0, "quality": 0}, 
-                       "news": {"count": 0, "quality": 0}, "discord": {"count": 0, "quality": 0}}
-            
-            for item in result.get("headlines_analyzed", []):
-                source_lower = item.get("source", "").lower()
-                if "reuters" in source_lower or "bloomberg" in source_lower:
-                    sources["news"]["count"] += 1
-                    sources["news"]["quality"] = max(sources["news"]["quality"], int(item["weighted_score"]))
-                elif "twitter" in source_lower:
-                    sources["twitter"]["count"] += 1
-                    sources["twitter"]["quality"] = max(sources["twitter"]["quality"], int(item["weighted_score"]))
-                elif "reddit" in source_lower:
-                    sources["reddit"]["count"] += 1
-                    sources["reddit"]["quality"] = max(sources["reddit"]["quality"], int(item["weighted_score"]))
-                else:
-                    sources["discord"]["count"] += 1
-                    sources["discord"]["quality"] = max(sources["discord"]["quality"], int(item["weighted_score"]))
+        aggregate = result["aggregate"]
+        
+        # One pass over the headlines: source breakdown (count + best quality per bucket)
+        # and bullish/bearish label counts
+        counts = Counter()
+        quality = defaultdict(int)
+        bullish_count = bearish_count = 0
+        for item in headlines_analyzed:
+            bucket = _source_bucket(item["source"])
+            counts[bucket] += 1
+            score = int(item["weighted_score"])
+            if score > quality[bucket]:
+                quality[bucket] = score
             
-            sentiment_score = aggregate.get("aggregate_score", 50)
-            bullish_count = len([h for h in result.get("headlines_analyzed", []) if h["finbert_label"] == "positive"])
-            bearish_count = len([h for h in result.get("headlines_analyzed", []) if h["finbert_label"] == "negative"])
+            label = item["finbert_label"]
+            if label == "positive":
+                bullish_count += 1
+            elif label == "negative":
+                bearish_count += 1
+        
+        sources = {bucket: {"count": counts[bucket], "quality": quality[bucket]} for bucket in _SOURCE_BUCKETS}
+        
+        sentiment_score = aggregate["aggregate_score"]
+        trusted_count = aggregate["trusted_count"]
+        
+        sentiment_data = {
+            "sentiment_score": round(sentiment_score, 2),
+            "bullish_count": bullish_count * 1000,
+            "bearish_count": bearish_count * 1000,
+            "confidence": round(min(95, sentiment_score * 0.9 + trusted_count * 5), 2),
+            "sources": sources,
+        }
+        
+        # Save to database in the background; the broadcast doesn't depend on the commit
+        task = asyncio.create_task(self._persist_sentiment(Sentiment(**sentiment_data)))
+        self._persist_tasks.add(task)
+        task.add_done_callback(self._persist_tasks.discard)
+        
+        # Broadcast the update and generate signals concurrently (both only read `result`)
+        await asyncio.gather(
+            self._broadcast_sentiment(sentiment_data, result, aggregate),
+            self._try_generate_signals(result),
+        )
+    
+    async def _persist_sentiment(self, sentiment_obj: Sentiment):
+        """Write a sentiment snapshot to the database"""
+        try:
+            async with self.session_maker() as session:
+                session.add(sentiment_obj)
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to save sentiment: {e}")
+    
+    async def _broadcast_sentiment(self, sentiment_data: dict, result: dict, aggregate: dict):
+        """Broadcast the sentiment update and log the aggregate to the console"""
+        await self.ws_manager.broadcast({
+            "type": "sentiment:update",
+            "data": {
+                **sentiment_data,
+                "updated_at": self._now_iso,
+                "by_asset": result["by_asset"],
+            },
+            "timestamp": self._now_iso,
+        })
+        
+        # Log aggregate
+        sentiment_score = aggregate["aggregate_score"]
+        score_emoji = "🟢" if sentiment_score > 60 else ("🔴" if sentiment_score < 40 else "🟡")
+        await self._broadcast_thought(
+            f"{score_emoji} Aggregate sentiment: {sentiment_score:.1f}% (trusted: {aggregate['trusted_count']}, spam: {aggregate['spam_count']})",
+            "success" if sentiment_score > 70 or sentiment_score < 30 else "info"
+        )
+    
+    async def _try_generate_signals(self, sentiment_result: dict):
+        """Try to generate trading signals based on sentiment data"""
+        
+        by_asset = sentiment_result["by_asset"]
+        
+        # Assets are independent: fan out the market-data lookups so the step takes
+        # the slowest asset, not the sum
+        sentiment_changes = _rng.uniform(-3, 8, size=len(by_asset)).tolist()  # Simulated for demo
+        contexts = await asyncio.gather(
+            *(
+                self._signal_context(asset, asset_data, change)
+                for (asset, asset_data), change in zip(by_asset.items(), sentiment_changes)
+            ),
+            return_exceptions=True
+        )
+        contexts = [ctx for ctx in contexts if isinstance(ctx, SignalContext)]
+        if not contexts:
+            return
+        
+        # Generate signals for every asset in one batch
+        try:
+            signals = await signal_generator.generate_signals(contexts)
+        except Exception as e:
+            logger.error(f"Signal generation error: {e}")
+            return
+        
+        for ctx, signal in zip(contexts, signals):
+            if signal:
+                await self._announce_signal(ctx.asset, signal)
+    
+    async def _signal_context(self, asset: str, asset_data: dict, sentiment_change: float) -> Optional[SignalContext]:
+        """Fetch market context for one asset (None if price data is unavailable)"""
+        try:
+            # Map asset names to yfinance symbols
+            symbol_map = {"BTC": "BTC-USD", "AAPL": "AAPL", "GOLD": "GC=F"}
+            symbol = symbol_map.get(asset, "BTC-USD")
             
-            sentiment_obj = Sentiment(
-                sentiment_score=round(sentiment_score, 2),
-                bullish_count=bullish_count * 1000,
-                bearish_count=bearish_count * 1000,
-                confidence=round(min(95, sentiment_score * 0.9 + aggregate.get("trusted_count", 0) * 5), 2),
-                sources=sources,
+            # Get market data
+            price_data, trend, volatility = await asyncio.gather(
+                market_data_service.get_price(symbol),
+                market_data_service.get_1h_trend(symbol),
+                market_data_service.get_volatility(symbol),
             )
             
-            session.add(sentiment_obj)
-            await session.commit()
-            await session.refresh(sentiment_obj)
-            
-            # Broadcast sentiment update
-            await self.ws_manager.broadcast({
-                "type": "sentiment:update",
-                "data": {
-                    "sentiment_score": sentiment_obj.sentiment_score,
-                    "bullish_count": sentiment_obj.bullish_count,
-                    "bearish_count": sentiment_obj.bearish_count,
-                    "confidence": sentiment_obj.confidence,
-                    "sources": sentiment_obj.sources,
-                    "updated_at": sentiment_obj.created_at.isoformat() if sentiment_obj.created_at else datetime.utcnow().isoformat(),
-                    "by_asset": result.get("by_asset", {}),
-                },
-                "timestamp": datetime.utcnow().isoformat(),
-            })
+            if not price_data["success"]:
+                return None
             
-            # Log aggregate
-            score_emoji = "🟢" if sentiment_score > 60 else ("🔴" if sentiment_score < 40 else "🟡")
-            await self._broadcast_thought(
-                f"{score_emoji} Aggregate sentiment: {sentiment_score:.1f}% (trusted: {aggregate.get('trusted_count', 0)}, spam: {aggregate.get('spam_count', 0)})",
-                "success" if sentiment_score > 70 or sentiment_score < 30 else "info"
+            # Build signal context
+            return SignalContext(
+                asset=asset,
+                sentiment_score=asset_data["aggregate_score"],
+                sentiment_change=sentiment_change,
+                price=price_data["price"],
+                price_change=price_data["change"],
+                trend=trend,
+                volatility=volatility,
+                trusted_source_count=asset_data["trusted_count"],
+                spam_source_count=asset_data["spam_count"]
             )
-        
-        # Try to generate signals for each asset
-        await self._try_generate_signals(result)
+        except Exception as e:
+            logger.error(f"Signal generation error for {asset}: {e}")
+            return None
     
-    async def _try_generate_signals(self, sentiment_result: dict):
-        """Try to generate trading signals based on sentiment data"""
-        
-        by_asset = sentiment_result.get("by_asset", {})
+    async def _announce_signal(self, asset: str, signal: dict):
+        """Broadcast a new signal and log it to the console"""
+        await self.ws_manager.broadcast({
+            "type": "signal:new",
+            "data": signal
+        })
         
-        for asset, asset_data in by_asset.items():
-            try:
-                # Map asset names to yfinance symbols
-                symbol_map = {"BTC": "BTC-USD", "AAPL": "AAPL", "GOLD": "GC=F"}
-                symbol = symbol_map.get(asset, "BTC-USD")
-                
-                # Get market data
-                price_data = await market_data_service.get_price(symbol)
-                trend = await market_data_service.get_1h_trend(symbol)
-                volatility = await market_data_service.get_volatility(symbol)
-                
-                if not price_data.get("success"):
-                    continue
-                
-                # Build signal context
-                ctx = SignalContext(
-                    asset=asset,
-                    sentiment_score=asset_data.get("aggregate_score", 50),
-                    sentiment_change=random.uniform(-3, 8),  # Simulated for demo
-                    price=price_data.get("price", 0),
-                    price_change=price_data.get("change", 0),
-                    trend=trend,
-                    volatility=volatility,
-                    trusted_source_count=asset_data.get("trusted_count", 0),
-                    spam_source_count=asset_data.get("spam_count", 0)
-                )
-                
-                # Generate signal
-                signal = await signal_generator.generate_signal(ctx)
-                
-                if signal:
-                    # Broadcast signal
-                    await self.ws_manager.broadcast({
-                        "type": "signal:new",
-                        "data": signal
-                    })
-                    
-                    # Log to console
-                    action_emoji = "🟢 BUY" if signal["action"] == "BUY" else "🔴 SELL"
-                    await self._broadcast_thought(
-                        f"🎯 SIGNAL: {action_emoji} {asset} @ ${signal['entry_price']:,.2f} | Conf: {signal['confidence']:.0f}%",
-                        "success",
-                        asset
-                    )
-                    await self._broadcast_thought(
-                        f"💡 {signal['reasoning']}",
-                        "info",
-                        asset
-                    )
-                    
-            except Exception as e:
-                logger.error(f"Signal generation error for {asset}: {e}")
+        # Log to console
+        action_emoji = "🟢 BUY" if signal["action"] == "BUY" else "🔴 SELL"
+        await self._broadcast_thought(
+            f"🎯 SIGNAL: {action_emoji} {asset} @ ${signal['entry_price']:,.2f} | Conf: {signal['confidence']:.0f}%",
+            "success",
+            asset
+        )
+        await self._broadcast_thought(
+            f"💡 {signal['reasoning']}",
+            "info",
+            asset
+        )
     
     def stop(self):
         """Stop the streaming loop"""
@@ -12,9 +12,11 @@ Features:
 import uuid
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal
 from dataclasses import dataclass
 
+import numpy as np
+
 from app.models.signal import SignalAction
 from app.services.pattern_recognizer import pattern_recognizer, MarketPattern
 
@@ -37,6 +39,45 @@ class SignalContext:
     spam_source_count: int = 0
 
 
+# XAI reasoning fragments, parsed once at import
+_BULLISH_SENT_FMT = "{:.0f}% bullish sentiment score".format
+_BEARISH_SENT_FMT = "{:.0f}% bearish sentiment score".format
+_SENT_SPIKE_FMT = "+{:.1f}% sentiment spike in last hour".format
+_SENT_DROP_FMT = "{:.1f}% sentiment drop in last hour".format
+_WHALE_ACCUM_FMT = "${:.1f}M whale accumulation detected".format
+_WHALE_DIST_FMT = "${:.1f}M whale distribution detected".format
+_TRUSTED_FMT = "{} trusted sources (Reuters/Bloomberg)".format
+_REASONING_FMT = "{}: {}. Historical accuracy for this setup: {:.0f}%.".format
+
+
+def _compute_levels(
+    entries: np.ndarray,
+    volatilities: np.ndarray,
+    is_buy: np.ndarray,
+    rr_target: float
+) -> Dict[str, list]:
+    """
+    Vectorised stop-loss / take-profit / R:R for a batch of candidate signals.
+    
+    Same operations, in the same order, as the scalar path in generate_signal
+    (float64 element-wise, so results are bit-identical): the stop sits
+    volatility × 2% away from entry, the target rr_target × that risk on the other side.
+    """
+    offset = volatilities * 0.02
+    stop_loss = np.where(is_buy, entries * (1 - offset), entries * (1 + offset))
+    risk = np.where(is_buy, entries - stop_loss, stop_loss - entries)
+    take_profit = np.where(is_buy, entries + risk * rr_target, entries - risk * rr_target)
+    
+    reward = np.abs(take_profit - entries)
+    rr_ratio = np.divide(reward, risk, out=np.zeros_like(risk), where=risk > 0)
+    
+    return {
+        "stop_loss": stop_loss.tolist(),
+        "take_profit": take_profit.tolist(),
+        "rr_ratio": rr_ratio.tolist(),
+    }
+
+
 class XAISignalGenerator:
     """
     Explainable AI Signal Generator
@@ -73,11 +114,8 @@ class XAISignalGenerator:
         Returns:
             Position size as percentage of portfolio
         """
-        confidence_factor = confidence / 100
-        volatility_factor = 1 / (1 + volatility)
-        
-        # Kelly-inspired formula with volatility adjustment
-        position_size = risk_percent * confidence_factor * volatility_factor
+        # Kelly-inspired formula with volatility adjustment, folded into a single division
+        position_size = risk_percent * confidence / (100 * (1 + volatility))
         
         # Cap at 5% max position
         return min(5.0, max(0.1, position_size))
@@ -92,13 +130,13 @@ class XAISignalGenerator:
         
         # Sentiment analysis
         if action == "BUY":
-            reasons.append(f"{ctx.sentiment_score:.0f}% bullish sentiment score")
+            reasons.append(_BULLISH_SENT_FMT(ctx.sentiment_score))
             if ctx.sentiment_change > 5:
-                reasons.append(f"+{ctx.sentiment_change:.1f}% sentiment spike in last hour")
+                reasons.append(_SENT_SPIKE_FMT(ctx.sentiment_change))
         else:
-            reasons.append(f"{ctx.sentiment_score:.0f}% bearish sentiment score")
+            reasons.append(_BEARISH_SENT_FMT(ctx.sentiment_score))
             if ctx.sentiment_change < -5:
-                reasons.append(f"{ctx.sentiment_change:.1f}% sentiment drop in last hour")
+                reasons.append(_SENT_DROP_FMT(ctx.sentiment_change))
         
         # Price trend
         if ctx.trend == "UP" and action == "BUY":
@@ -107,16 +145,14 @@ class XAISignalGenerator:
             reasons.append("price trending downward (1h)")
         
         # Whale activity
-        if ctx.whale_activity:
-            whale_amount_m = ctx.whale_amount_usd / 1_000_000
-            if ctx.whale_activity == "accumulation" and action == "BUY":
-                reasons.append(f"${whale_amount_m:.1f}M whale accumulation detected")
-            elif ctx.whale_activity == "distribution" and action == "SELL":
-                reasons.append(f"${whale_amount_m:.1f}M whale distribution detected")
+        if ctx.whale_activity == "accumulation" and action == "BUY":
+            reasons.append(_WHALE_ACCUM_FMT(ctx.whale_amount_usd / 1_000_000))
+        elif ctx.whale_activity == "distribution" and action == "SELL":
+            reasons.append(_WHALE_DIST_FMT(ctx.whale_amount_usd / 1_000_000))
         
         # Source quality
         if ctx.trusted_source_count > 0:
-            reasons.append(f"{ctx.trusted_source_count} trusted sources (Reuters/Bloomberg)")
+            reasons.append(_TRUSTED_FMT(ctx.trusted_source_count))
         
         # Build reasoning string
         reason_text = " + ".join(reasons)
@@ -124,7 +160,7 @@ class XAISignalGenerator:
         # Add historical accuracy (simulated for demo)
         historical_accuracy = 60 + (confidence - 70) * 0.5  # 60-75% range
         
-        return f"{action}: {reason_text}. Historical accuracy for this setup: {historical_accuracy:.0f}%."
+        return _REASONING_FMT(action, reason_text, historical_accuracy)
     
     def _detect_divergence(self, ctx: SignalContext) -> Optional[dict]:
         """
@@ -149,25 +185,14 @@ class XAISignalGenerator:
             }
         return None
     
-    async def generate_signal(
-        self,
-        ctx: SignalContext,
-        portfolio_size: float = 10000,
-        risk_percent: float = 2.0
-    ) -> Optional[dict]:
+    def _decide_action(self, ctx: SignalContext) -> Optional[tuple]:
         """
-        Generate a trading signal with XAI reasoning.
+        Sentiment/trend gate for a candidate signal.
         
-        Args:
-            ctx: SignalContext with all market data
-            portfolio_size: Portfolio value in USD
-            risk_percent: Risk per trade (default 2%)
-            
         Returns:
-            Signal dict with reasoning, or None if no signal
+            (SignalAction, confidence), or None if there is no signal
         """
         # Determine action based on sentiment + trend
-        action = None
         if ctx.sentiment_score > self.BULLISH_SENTIMENT_THRESHOLD and ctx.trend in ["UP", "FLAT"]:
             action = SignalAction.BUY
             confidence = min(100, ctx.sentiment_score * 0.9 + (ctx.trusted_source_count * 2))
@@ -183,6 +208,30 @@ class XAISignalGenerator:
             logger.debug(f"Signal rejected: confidence {confidence:.1f}% below threshold")
             return None
         
+        return action, confidence
+    
+    async def generate_signal(
+        self,
+        ctx: SignalContext,
+        portfolio_size: float = 10000,
+        risk_percent: float = 2.0
+    ) -> Optional[dict]:
+        """
+        Generate a trading signal with XAI reasoning.
+        
+        Args:
+            ctx: SignalContext with all market data
+            portfolio_size: Portfolio value in USD
+            risk_percent: Risk per trade (default 2%)
+            
+        Returns:
+            Signal dict with reasoning, or None if no signal
+        """
+        decision = self._decide_action(ctx)
+        if decision is None:
+            return None
+        action, confidence = decision
+        
         # Calculate price levels
         entry = ctx.price
         
@@ -199,6 +248,67 @@ class XAISignalGenerator:
         reward_amount = abs(take_profit - entry)
         rr_ratio = reward_amount / risk_amount if risk_amount > 0 else 0
         
+        return await self._build_signal(
+            ctx, action, confidence, stop_loss, take_profit, rr_ratio, portfolio_size, risk_percent
+        )
+    
+    async def generate_signals(
+        self,
+        contexts: List[SignalContext],
+        portfolio_size: float = 10000,
+        risk_percent: float = 2.0
+    ) -> List[Optional[dict]]:
+        """
+        Generate signals for a batch of assets.
+        
+        Price levels for every candidate that passes the sentiment gate are
+        computed in one vectorised pass; the XAI/pattern work only runs for
+        candidates that also pass the R:R filter.
+        
+        Returns:
+            One entry per context: signal dict, or None if no signal
+        """
+        signals: List[Optional[dict]] = [None] * len(contexts)
+        
+        candidates = []
+        for i, ctx in enumerate(contexts):
+            decision = self._decide_action(ctx)
+            if decision is not None:
+                candidates.append((i, ctx, *decision))
+        
+        if not candidates:
+            return signals
+        
+        levels = _compute_levels(
+            np.array([ctx.price for _, ctx, _, _ in candidates], dtype=np.float64),
+            np.array([ctx.volatility for _, ctx, _, _ in candidates], dtype=np.float64),
+            np.array([action == SignalAction.BUY for _, _, action, _ in candidates]),
+            self.MIN_RR_RATIO,
+        )
+        
+        for (i, ctx, action, confidence), stop_loss, take_profit, rr_ratio in zip(
+            candidates, levels["stop_loss"], levels["take_profit"], levels["rr_ratio"]
+        ):
+            signals[i] = await self._build_signal(
+                ctx, action, confidence, stop_loss, take_profit, rr_ratio, portfolio_size, risk_percent
+            )
+        
+        return signals
+    
+    async def _build_signal(
+        self,
+        ctx: SignalContext,
+        action: SignalAction,
+        confidence: float,
+        stop_loss: float,
+        take_profit: float,
+        rr_ratio: float,
+        portfolio_size: float,
+        risk_percent: float
+    ) -> Optional[dict]:
+        """Apply the R:R filter, then size, explain and pattern-enhance the signal"""
+        entry = ctx.price
+        
         # R:R filter
         if rr_ratio < self.MIN_RR_RATIO:
             logger.debug(f"Signal rejected: R:R {rr_ratio:.2f} below {self.MIN_RR_RATIO}")
@@ -216,7 +326,8 @@ class XAISignalGenerator:
         # Detect divergence
         divergence = self._detect_divergence(ctx)
         
-        # Create base signal
+        # Create base signal (one clock read for both timestamps)
+        now = datetime.utcnow()
         signal = {
             "signal_id": f"sig_{uuid.uuid4().hex[:8]}",
             "asset_code": ctx.asset,
@@ -231,8 +342,8 @@ class XAISignalGenerator:
             "sentiment_score_at_signal": round(ctx.sentiment_score, 2),
             "reasoning": reasoning,  # XAI explanation
             "divergence": divergence,
-            "expires_at": (datetime.utcnow() + timedelta(hours=2)).isoformat(),
-            "created_at": datetime.utcnow().isoformat(),
+            "expires_at": (now + timedelta(hours=2)).isoformat(),
+            "created_at": now.isoformat(),
         }
         
         # Enhance with Pattern Engine
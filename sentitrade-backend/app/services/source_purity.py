@@ -9,7 +9,10 @@ Spam sources (0.5x weight):
 """
 
 import re
-from typing import Tuple
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+import numpy as np
 
 # Trusted sources get 1.5x weight multiplier
 TRUSTED_PATTERNS = [
@@ -36,7 +39,27 @@ SPAM_PATTERNS = [
     r'\bsend\s*\d+\s*receive\b',
 ]
 
+# Each list fused into one alternation, compiled once at import, so a single
+# search scans for every pattern (case-insensitive: no lowercased copy needed)
+TRUSTED_RE = re.compile("|".join(f"(?:{p})" for p in TRUSTED_PATTERNS), re.IGNORECASE)
+SPAM_RE = re.compile("|".join(f"(?:{p})" for p in SPAM_PATTERNS), re.IGNORECASE)
+
+# Both lists in one pattern; the named group of each hit says which list matched
+SOURCE_RE = re.compile(
+    f"(?P<trusted>{TRUSTED_RE.pattern})|(?P<spam>{SPAM_RE.pattern})", re.IGNORECASE
+)
+
+
+class SourcePurity(NamedTuple):
+    """Result of apply_source_purity for a single headline"""
+    original_score: float
+    weighted_score: float
+    weight: float
+    source_category: str
 
+
+# Pure function of two strings; the streamers re-score the same headlines constantly
+@lru_cache(maxsize=4096)
 def calculate_source_weight(source: str, headline: str) -> Tuple[float, str]:
     """
     Calculate weight multiplier based on source and headline content.
@@ -50,23 +73,23 @@ def calculate_source_weight(source: str, headline: str) -> Tuple[float, str]:
         - weight_multiplier: 1.5 (trusted), 1.0 (neutral), 0.5 (spam)
         - category: "trusted", "neutral", or "spam"
     """
-    combined_text = f"{source} {headline}".lower()
+    combined_text = f"{source} {headline}"
     
-    # Check for trusted patterns
-    for pattern in TRUSTED_PATTERNS:
-        if re.search(pattern, combined_text, re.IGNORECASE):
+    # Single scan: trusted wins outright, spam only once no trusted hit follows
+    is_spam = False
+    for match in SOURCE_RE.finditer(combined_text):
+        if match.lastgroup == "trusted":
             return (1.5, "trusted")
+        is_spam = True
     
-    # Check for spam patterns
-    for pattern in SPAM_PATTERNS:
-        if re.search(pattern, combined_text, re.IGNORECASE):
-            return (0.5, "spam")
+    if is_spam:
+        return (0.5, "spam")
     
     # Default neutral weight
     return (1.0, "neutral")
 
 
-def apply_source_purity(sentiment_score: float, source: str, headline: str) -> dict:
+def apply_source_purity(sentiment_score: float, source: str, headline: str) -> SourcePurity:
     """
     Apply Source Purity weighting to a sentiment score.
     
@@ -76,12 +99,12 @@ def apply_source_purity(sentiment_score: float, source: str, headline: str) -> d
         headline: Headline text
         
     Returns:
-        {
-            "original_score": raw score,
-            "weighted_score": after source purity applied,
-            "weight": multiplier used,
-            "source_category": trusted/neutral/spam
-        }
+        SourcePurity(
+            original_score=raw score,
+            weighted_score=after source purity applied,
+            weight=multiplier used,
+            source_category=trusted/neutral/spam
+        )
     """
     weight, category = calculate_source_weight(source, headline)
     
@@ -93,12 +116,12 @@ def apply_source_purity(sentiment_score: float, source: str, headline: str) -> d
     # Clamp to 0-100 range
     weighted_score = max(0, min(100, weighted_score))
     
-    return {
-        "original_score": round(sentiment_score, 2),
-        "weighted_score": round(weighted_score, 2),
-        "weight": weight,
-        "source_category": category
-    }
+    return SourcePurity(
+        original_score=round(sentiment_score, 2),
+        weighted_score=round(weighted_score, 2),
+        weight=weight,
+        source_category=category
+    )
 
 
 def get_aggregate_sentiment(headlines_with_scores: list[dict]) -> dict:
@@ -124,27 +147,25 @@ def get_aggregate_sentiment(headlines_with_scores: list[dict]) -> dict:
             "total_count": 0
         }
     
-    total_weighted_score = 0.0
-    total_weight = 0.0
-    trusted_count = 0
-    spam_count = 0
+    n = len(headlines_with_scores)
     
-    for item in headlines_with_scores:
-        headline = item.get("headline", "")
-        source = item.get("source", "")
-        score = item.get("sentiment_score", 50.0)
-        
-        weight, category = calculate_source_weight(source, headline)
-        
-        if category == "trusted":
-            trusted_count += 1
-        elif category == "spam":
-            spam_count += 1
-        
-        total_weighted_score += score * weight
-        total_weight += weight
+    # Classify every headline once, then reduce with vector ops
+    classified = [
+        calculate_source_weight(item.get("source", ""), item.get("headline", ""))
+        for item in headlines_with_scores
+    ]
+    categories = [category for _, category in classified]
+    
+    scores = np.fromiter(
+        (item.get("sentiment_score", 50.0) for item in headlines_with_scores), dtype=np.float64, count=n
+    )
+    weights = np.fromiter((weight for weight, _ in classified), dtype=np.float64, count=n)
+    
+    total_weight = float(weights.sum())
+    trusted_count = categories.count("trusted")
+    spam_count = categories.count("spam")
     
-    aggregate_score = total_weighted_score / total_weight if total_weight > 0 else 50.0
+    aggregate_score = float(scores @ weights) / total_weight if total_weight > 0 else 50.0
     
     return {
         "aggregate_score": round(aggregate_score, 2),
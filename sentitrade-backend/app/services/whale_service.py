@@ -1,15 +1,39 @@
 import asyncio
 import logging
 import random
+import time
 import uuid
 from datetime import datetime
+from typing import Dict, List, Tuple
+import numpy as np
+from sqlalchemy import insert, text
 from sqlalchemy.ext.asyncio import async_sessionmaker
 from app.models.whale import WhaleActivity, TxType
+from app.config import settings
 from app.services.market_data import market_data_service
 from app.ws.manager import WebSocketManager
 
 logger = logging.getLogger(__name__)
 
+# Whale rows are buffered and written together: every FLUSH_INTERVAL seconds,
+# or as soon as FLUSH_SIZE rows are waiting
+FLUSH_INTERVAL = 2.0
+FLUSH_SIZE = 50
+# Rows kept for retry after failed writes; beyond this the oldest are discarded
+MAX_BUFFERED = 5000
+# Bursts at least this large go through asyncpg's binary COPY instead of INSERT
+COPY_THRESHOLD = 500
+_COPY_COLUMNS = (
+    "id", "wallet_address", "amount_usd", "tx_type",
+    "timestamp", "trust_score", "whale_age_days", "asset_code",
+)
+# Backoff doubles per consecutive loop failure up to 2**MAX_ERR_STREAK (capped at 60s)
+MAX_ERR_STREAK = 6
+
+# Simulation-only randomness (not security sensitive); whale attributes are drawn
+# as arrays, one call per field per tick
+_rng = np.random.default_rng()
+
 class WhaleService:
     """
     Simulates Whale Activity based on market volatility.
@@ -21,21 +45,111 @@ class WhaleService:
         self._running = False
         self._task = None
         self._monitored_assets = ["BTC-USD", "ETH-USD"]
+        self._asset_code: Dict[str, str] = {}  # BTC-USD -> BTC, filled in start()
+        self._buffer: List[dict] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = None
+        self._price_cache = (0.0, None)  # (monotonic fetch time, prices)
+        self._err_streak = 0  # Consecutive failed loop iterations (drives the backoff)
         
     async def start(self):
         self._running = True
+        self._asset_code = {t: t.split("-")[0] for t in self._monitored_assets}
         self._task = asyncio.create_task(self._simulation_loop())
+        self._flush_task = asyncio.create_task(self._flush_loop())
         logger.info("🐋 Whale Service started")
         
     async def stop(self):
         self._running = False
-        if self._task:
-            self._task.cancel()
+        for task in (self._task, self._flush_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        
+        # Persist whatever is still buffered (including rows an interrupted flush put back)
+        await self._flush()
+        logger.info("🐋 Whale Service stopped")
+
+    async def _get_prices(self) -> dict:
+        """Prices for the monitored assets, cached for whale_price_ttl_seconds"""
+        now = time.monotonic()
+        fetched_at, prices = self._price_cache
+        if prices is not None and now - fetched_at < settings.whale_price_ttl_seconds:
+            return prices
+        
+        prices = await market_data_service.get_prices(self._monitored_assets)
+        self._price_cache = (now, prices)
+        return prices
+
+    async def _flush_loop(self):
+        """Periodically write buffered whale rows"""
+        while self._running:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            await self._flush()
+
+    async def _flush(self):
+        """Write all buffered whale rows in a single multi-row INSERT (or COPY for large bursts)"""
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            rows, self._buffer = self._buffer, []
+            committed = False
+            
             try:
-                await self._task
+                async with self.session_maker() as session:
+                    dialect = session.bind.dialect
+                    if dialect.name == "postgresql":
+                        # Simulated analytics rows: don't wait on the WAL fsync
+                        await session.execute(text("SET LOCAL synchronous_commit = off"))
+                    if dialect.driver == "asyncpg" and len(rows) >= COPY_THRESHOLD:
+                        await self._copy_rows(session, rows)
+                    else:
+                        await session.execute(insert(WhaleActivity), rows)
+                    await session.commit()
+                    committed = True
             except asyncio.CancelledError:
-                pass
-        logger.info("🐋 Whale Service stopped")
+                # Cancelled mid-write (e.g. by stop()): keep the rows for the final flush
+                if not committed:
+                    self._requeue(rows)
+                raise
+            except Exception as e:
+                logger.error(f"Failed to save {len(rows)} whale events: {e}")
+                if not committed:
+                    self._requeue(rows)
+
+    def _requeue(self, rows: List[dict]):
+        """Put unwritten rows back ahead of newer ones, keeping at most MAX_BUFFERED"""
+        self._buffer = rows + self._buffer
+        overflow = len(self._buffer) - MAX_BUFFERED
+        if overflow > 0:
+            del self._buffer[:overflow]
+            logger.warning(f"⚠️ Whale buffer full, discarded {overflow} oldest events")
+
+    async def _copy_rows(self, session, rows: List[dict]):
+        """Stream rows into whale_activity with asyncpg's binary COPY (same transaction)"""
+        conn = await session.connection()
+        raw = await conn.get_raw_connection()
+        # COPY bypasses SQLAlchemy column defaults, so fill the client-side id here;
+        # the Enum column stores member names
+        records = [
+            (
+                uuid.uuid4(),
+                row["wallet_address"],
+                row["amount_usd"],
+                row["tx_type"].name,
+                row["timestamp"],
+                row["trust_score"],
+                row["whale_age_days"],
+                row["asset_code"],
+            )
+            for row in rows
+        ]
+        await raw.driver_connection.copy_records_to_table(
+            WhaleActivity.__tablename__, records=records, columns=_COPY_COLUMNS
+        )
 
     async def _simulation_loop(self):
         """Generates whale transactions based on price movement"""
@@ -43,73 +157,100 @@ class WhaleService:
         
         while self._running:
             try:
-                # 1. Check market trends
-                prices = await market_data_service.get_prices(self._monitored_assets)
+                # 1. Check market trends (reuse the last snapshot within the TTL)
+                prices = await self._get_prices()
+                
+                # Random chance to spawn a whale event + volatility bonus, decided for
+                # every ticker in one draw
+                # In a real app, this would be triggered by on-chain analysis APIs
+                tickers = list(prices)
+                changes = np.fromiter(
+                    (abs(prices[t].get("change", 0)) for t in tickers),
+                    dtype=np.float64,
+                    count=len(tickers),
+                )
+                
+                # Base chance 10%, +10% per 1% change
+                chances = 0.1 + changes * 0.1
+                fires = _rng.random(len(tickers)) < chances
+                
+                fired = [(tickers[i], prices[tickers[i]]) for i in np.flatnonzero(fires)]
+                if fired:
+                    await self._generate_whale_events(fired)
                 
-                for ticker, data in prices.items():
-                    # Random chance to spawn a whale event + volatility bonus
-                    # In a real app, this would be triggered by on-chain analysis APIs
-                    change = abs(data.get("change", 0))
-                    
-                    # Base chance 10%, +10% per 1% change
-                    chance = 0.1 + (change * 0.1)
-                    
-                    if random.random() < chance:
-                        await self._generate_whale_event(ticker, data)
+                self._err_streak = 0
                 
                 # Wait random time (5-15s)
                 await asyncio.sleep(random.randint(5, 15))
                 
             except Exception as e:
-                logger.error(f"Whale service error: {e}")
-                await asyncio.sleep(5)
+                # Exponential backoff with jitter (2s, 4s, ... capped at 60s) so an
+                # upstream outage isn't polled at a fixed rate
+                self._err_streak = min(self._err_streak + 1, MAX_ERR_STREAK)
+                delay = min(60, 2 ** self._err_streak) + random.random()
+                logger.error(f"Whale service error: {e} (retrying in {delay:.1f}s)")
+                await asyncio.sleep(delay)
 
-    async def _generate_whale_event(self, ticker: str, price_data: dict):
-        """create and broadcast a fake whale transaction"""
-        is_bullish = price_data.get("change", 0) > 0
+    async def _generate_whale_events(self, fired: List[Tuple[str, dict]]):
+        """create fake whale transactions (one per fired ticker) and broadcast them in one frame"""
+        k = len(fired)
         
         # If bullish, higher chance of accumulation, but sometimes profit taking (distribution)
-        if is_bullish:
-            weights = [0.7, 0.3] # Buy, Sell
-        else:
-            weights = [0.3, 0.7] # Buy, Sell
-            
-        tx_type = random.choices([TxType.ACCUMULATION, TxType.DISTRIBUTION], weights=weights)[0]
+        buy_chance = np.fromiter(
+            (0.7 if data.get("change", 0) > 0 else 0.3 for _, data in fired),
+            dtype=np.float64,
+            count=k,
+        )
+        is_buy = (_rng.random(k) < buy_chance).tolist()
         
-        # Generate random wallet
-        wallet = f"0x{random.randbytes(20).hex()}"
+        # Random wallets: 20 bytes (40 hex chars) each, from a single draw
+        wallet_hex = _rng.bytes(20 * k).hex()
         
         # Amount: $500k to $50M
-        amount = random.uniform(500_000, 50_000_000)
+        amounts = _rng.uniform(500_000, 50_000_000, k).tolist()
+        trust_scores = _rng.uniform(60, 99, k).tolist()
+        ages = _rng.integers(10, 3000, k, endpoint=True).tolist()
+        now = datetime.utcnow()
         
-        async with self.session_maker() as session:
-            whale = WhaleActivity(
-                wallet_address=wallet,
-                amount_usd=amount,
-                tx_type=tx_type,
-                timestamp=datetime.utcnow(),
-                trust_score=random.uniform(60, 99),
-                whale_age_days=random.randint(10, 3000),
-                asset_code=ticker.split("-")[0] # BTC-USD -> BTC
-            )
-            session.add(whale)
-            await session.commit()
-            
-            # Broadcast
-            await self.ws_manager.broadcast({
-                "type": "whale:alert",
-                "data": {
-                    "wallet_address": whale.wallet_address,
-                    "amount_usd": whale.amount_usd,
-                    "tx_type": whale.tx_type.value,
-                    "timestamp": whale.timestamp.isoformat(),
-                    "trust_score": whale.trust_score,
-                    "asset_code": whale.asset_code
-                }
-            })
-            
-            verb = "bought" if tx_type == TxType.ACCUMULATION else "sold"
-            logger.info(f"🐋 Whale Alert: {mask_wallet(wallet)} {verb} ${amount/1_000_000:.1f}M of {ticker}")
+        alerts = []
+        for i, (ticker, _) in enumerate(fired):
+            whale = {
+                "wallet_address": "0x" + wallet_hex[40 * i:40 * (i + 1)],
+                "amount_usd": amounts[i],
+                "tx_type": TxType.ACCUMULATION if is_buy[i] else TxType.DISTRIBUTION,
+                "timestamp": now,
+                "trust_score": trust_scores[i],
+                "whale_age_days": ages[i],
+                "asset_code": self._asset_code.get(ticker) or ticker.split("-")[0] # BTC-USD -> BTC
+            }
+            alerts.append(await self._record_whale(ticker, whale))
+        
+        # Broadcast the tick's alerts as a single frame
+        await self.ws_manager.broadcast({
+            "type": "whale:batch",
+            "data": alerts
+        })
+
+    async def _record_whale(self, ticker: str, whale: dict) -> dict:
+        """Buffer a whale row for the batched insert and return its alert payload"""
+        tx_type = whale["tx_type"]
+        
+        # Buffer for the batched insert; flush early if the buffer is full
+        self._buffer.append(whale)
+        if len(self._buffer) >= FLUSH_SIZE:
+            await self._flush()
+        
+        verb = "bought" if tx_type == TxType.ACCUMULATION else "sold"
+        logger.info(f"🐋 Whale Alert: {mask_wallet(whale['wallet_address'])} {verb} ${whale['amount_usd']/1_000_000:.1f}M of {ticker}")
+        
+        return {
+            "wallet_address": whale["wallet_address"],
+            "amount_usd": whale["amount_usd"],
+            "tx_type": tx_type.value,
+            "timestamp": whale["timestamp"].isoformat(),
+            "trust_score": whale["trust_score"],
+            "asset_code": whale["asset_code"]
+        }
 
 def mask_wallet(address):
     return f"{address[:6]}...{address[-4:]}"
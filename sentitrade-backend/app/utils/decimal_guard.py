@@ -5,18 +5,18 @@ Provides INR locale formatting for Indian market display.
 """
 
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Union
-import locale
+import math
+import re
 
-# Try to set Indian locale for currency formatting
-try:
-    locale.setlocale(locale.LC_ALL, 'en_IN.UTF-8')
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_ALL, 'en_IN')
-    except locale.Error:
-        # Fallback - will use manual formatting
-        pass
+# clean_data float fast path: powers of ten for common precisions, the scaled
+# magnitude below which float fractions are exact enough, and the tie margin
+# inside which a value is handed to the Decimal path
+_SCALE = tuple(10 ** i for i in range(7))
+_FAST_LIMIT = 1e9
+_TIE_EPSILON = 1e-6
 
 
 def clean_data(value: Union[float, int, str, None], decimals: int = 2) -> float:
@@ -34,6 +34,22 @@ def clean_data(value: Union[float, int, str, None], decimals: int = 2) -> float:
     if value is None:
         return 0.00
     
+    # Fast path: plain numbers whose scaled fraction is clearly off the .5 tie
+    # round in float arithmetic (same result as the Decimal path, ~20x cheaper)
+    if (type(value) is float or type(value) is int) and 0 <= decimals < len(_SCALE):
+        factor = _SCALE[decimals]
+        scaled = value * factor
+        if -_FAST_LIMIT < scaled < _FAST_LIMIT:
+            whole = math.floor(scaled)
+            frac = scaled - whole
+            if abs(frac - 0.5) > _TIE_EPSILON:
+                return (whole + (frac > 0.5)) / factor
+    
+    return _clean_data_exact(value, decimals)
+
+
+def _clean_data_exact(value: Union[float, int, str], decimals: int) -> float:
+    """Decimal ROUND_HALF_UP on the value's repr (ties, strings, huge/non-finite values)"""
     try:
         # Convert to Decimal for precise rounding
         d = Decimal(str(value))
@@ -44,6 +60,11 @@ def clean_data(value: Union[float, int, str, None], decimals: int = 2) -> float:
         return 0.00
 
 
+# Comma after every digit followed by an odd number (>= 3) of digits
+# (Indian grouping: 12,34,56,789)
+_INR_GROUP_RE = re.compile(r'(\d)(?=(?:\d\d)+\d$)')
+
+
 def format_inr(value: Union[float, int], include_symbol: bool = True) -> str:
     """
     Format a number using Indian numbering system (lakhs, crores).
@@ -58,7 +79,7 @@ def format_inr(value: Union[float, int], include_symbol: bool = True) -> str:
     """
     cleaned = clean_data(value)
     
-    # Manual Indian formatting (since locale might not be available)
+    # Manual Indian formatting (the process-wide locale is never changed)
     if cleaned < 0:
         sign = '-'
         cleaned = abs(cleaned)
@@ -72,18 +93,7 @@ def format_inr(value: Union[float, int], include_symbol: bool = True) -> str:
     # Format integer part with Indian grouping
     # First group of 3, then groups of 2
     s = str(int_part)
-    if len(s) > 3:
-        # Last 3 digits
-        last_three = s[-3:]
-        # Remaining digits, grouped by 2
-        remaining = s[:-3]
-        groups = []
-        while remaining:
-            groups.insert(0, remaining[-2:])
-            remaining = remaining[:-2]
-        formatted_int = ','.join(groups) + ',' + last_three
-    else:
-        formatted_int = s
+    formatted_int = _INR_GROUP_RE.sub(r'\1,', s) if len(s) > 3 else s
     
     symbol = '₹' if include_symbol else ''
     return f"{sign}{symbol}{formatted_int}.{dec_part:02d}"
@@ -109,6 +119,20 @@ def format_percent(value: Union[float, int], include_sign: bool = True) -> str:
     return f"{sign}{cleaned:.2f}%"
 
 
+# Substring markers for crypto and commodity tickers, each folded into one regex scan
+_CRYPTO_RE = re.compile('BTC|ETH|XRP|SOL|ADA|DOT|DOGE|MATIC|LINK|AVAX|-USD|/USD|USDT')
+_COMMODITY_RE = re.compile(r'GC=F|SI=F|CL=F|NG=F|GOLD|SILVER|CRUDE')
+
+# Common NSE stocks (fallback heuristic for bare symbols)
+_NSE_STOCKS = frozenset([
+    'RELIANCE', 'TCS', 'INFY', 'HDFCBANK', 'ICICIBANK', 'SBIN', 'HDFC',
+    'BAJFINANCE', 'BHARTIARTL', 'ITC', 'KOTAKBANK', 'LT', 'AXISBANK',
+    'ASIAN', 'MARUTI', 'TITAN', 'NESTLEIND', 'ULTRACEMCO', 'WIPRO',
+    'TATASTEEL', 'NTPC', 'POWERGRID', 'SUNPHARMA', 'TATAMOTORS', 'ADANIENT',
+])
+
+
+@lru_cache(maxsize=4096)
 def detect_asset_type(ticker: str) -> str:
     """
     Detect if a ticker is NSE, Crypto, or Commodity.
@@ -118,61 +142,58 @@ def detect_asset_type(ticker: str) -> str:
     ticker_upper = ticker.upper().strip()
     
     # Crypto patterns
-    crypto_pairs = ['BTC', 'ETH', 'XRP', 'SOL', 'ADA', 'DOT', 'DOGE', 'MATIC', 'LINK', 'AVAX']
-    if any(c in ticker_upper for c in crypto_pairs):
-        return 'CRYPTO'
-    if '-USD' in ticker_upper or '/USD' in ticker_upper or 'USDT' in ticker_upper:
+    if _CRYPTO_RE.search(ticker_upper):
         return 'CRYPTO'
     
     # Commodity patterns
-    commodity_tickers = ['GC=F', 'SI=F', 'CL=F', 'NG=F', 'GOLD', 'SILVER', 'CRUDE']
-    if any(c in ticker_upper for c in commodity_tickers):
+    if _COMMODITY_RE.search(ticker_upper):
         return 'COMMODITY'
     
     # NSE patterns
     if '.NS' in ticker_upper or '.BO' in ticker_upper:
         return 'NSE'
     
-    # Common NSE stocks (fallback heuristic)
-    nse_stocks = ['RELIANCE', 'TCS', 'INFY', 'HDFCBANK', 'ICICIBANK', 'SBIN', 'HDFC', 
-                  'BAJFINANCE', 'BHARTIARTL', 'ITC', 'KOTAKBANK', 'LT', 'AXISBANK',
-                  'ASIAN', 'MARUTI', 'TITAN', 'NESTLEIND', 'ULTRACEMCO', 'WIPRO',
-                  'TATASTEEL', 'NTPC', 'POWERGRID', 'SUNPHARMA', 'TATAMOTORS', 'ADANIENT']
-    if ticker_upper in nse_stocks:
+    if ticker_upper in _NSE_STOCKS:
         return 'NSE'
     
     return 'UNKNOWN'
 
 
-def get_mock_price(ticker: str) -> dict:
-    """
-    Return mock price data when real sources are unavailable.
-    Ensures the UI never shows errors - uses last known or synthetic data.
-    """
-    # Mock data for common assets
-    mock_data = {
-        'BTC-USD': {'price': 98500.00, 'change_pc': 2.15},
-        'ETH-USD': {'price': 3420.50, 'change_pc': 1.82},
-        'RELIANCE.NS': {'price': 2985.75, 'change_pc': 0.45},
-        'HDFCBANK.NS': {'price': 1580.20, 'change_pc': -0.32},
-        'TCS.NS': {'price': 4125.00, 'change_pc': 0.88},
-        'INFY.NS': {'price': 1890.50, 'change_pc': 0.15},
-        'GC=F': {'price': 2045.30, 'change_pc': 0.28},
-        'SI=F': {'price': 24.55, 'change_pc': 0.62},
-    }
-    
+# Mock data for common assets
+_MOCK_DATA = {
+    'BTC-USD': {'price': 98500.00, 'change_pc': 2.15},
+    'ETH-USD': {'price': 3420.50, 'change_pc': 1.82},
+    'RELIANCE.NS': {'price': 2985.75, 'change_pc': 0.45},
+    'HDFCBANK.NS': {'price': 1580.20, 'change_pc': -0.32},
+    'TCS.NS': {'price': 4125.00, 'change_pc': 0.88},
+    'INFY.NS': {'price': 1890.50, 'change_pc': 0.15},
+    'GC=F': {'price': 2045.30, 'change_pc': 0.28},
+    'SI=F': {'price': 24.55, 'change_pc': 0.62},
+}
+_DEFAULT_MOCK = {'price': 100.00, 'change_pc': 0.00}
+
+
+@lru_cache(maxsize=1024)
+def _mock_price(ticker: str) -> MappingProxyType:
+    """Frozen mock quote for a ticker (cleaned and classified once)"""
     ticker_upper = ticker.upper()
-    if ticker_upper in mock_data:
-        data = mock_data[ticker_upper]
-    else:
-        # Generate synthetic mock
-        data = {'price': 100.00, 'change_pc': 0.00}
+    # Generate synthetic mock for unknown tickers
+    data = _MOCK_DATA.get(ticker_upper, _DEFAULT_MOCK)
     
-    return {
+    return MappingProxyType({
         'asset': ticker_upper,
         'price': clean_data(data['price']),
         'change_pc': clean_data(data['change_pc']),
         'type': detect_asset_type(ticker),
         'is_mock': True,
         'sentiment': 0.50  # Neutral sentiment placeholder
-    }
+    })
+
+
+def get_mock_price(ticker: str) -> dict:
+    """
+    Return mock price data when real sources are unavailable.
+    Ensures the UI never shows errors - uses last known or synthetic data.
+    """
+    # Callers may annotate the quote, so hand out a shallow copy of the cached one
+    return dict(_mock_price(ticker))
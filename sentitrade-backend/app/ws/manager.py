@@ -1,53 +1,145 @@
+import asyncio
 import logging
-from typing import Dict, List
+from typing import Dict, Optional, Set
+
+import orjson
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
+# A client that can't take a frame within this many seconds is dropped
+SEND_TIMEOUT = 5.0
+# Frames buffered per client before it is considered too slow and dropped
+CLIENT_QUEUE_SIZE = 256
+# Seconds between sweeps for sockets that closed without a disconnect() call
+JANITOR_INTERVAL = 60.0
+# Broadcast fan-out yields to the event loop after every this many sockets
+BROADCAST_BATCH = 50
+# Close code sent to dropped clients ("Try Again Later") so the frontend reconnects
+DROP_CLOSE_CODE = 1013
+
 class WebSocketManager:
     def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
-    
+        self.active_connections: Dict[str, Set[WebSocket]] = {}
+        # Per-socket outbound queue and the writer task draining it
+        self._queues: Dict[WebSocket, asyncio.Queue] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
+        self._janitor: Optional[asyncio.Task] = None
+        # In-flight close() calls for dropped sockets (held so they aren't garbage-collected)
+        self._closing: Set[asyncio.Task] = set()
+
     async def connect(self, websocket: WebSocket, user_id: str):
         """Accept new WebSocket connection"""
         await websocket.accept()
-        
+
         if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        
-        self.active_connections[user_id].append(websocket)
+            self.active_connections[user_id] = set()
+
+        self.active_connections[user_id].add(websocket)
+
+        queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self._queues[websocket] = queue
+        self._writers[websocket] = asyncio.create_task(self._writer(user_id, websocket, queue))
+
+        if self._janitor is None or self._janitor.done():
+            self._janitor = asyncio.create_task(self._janitor_loop())
         logger.info(f"✅ WebSocket connected: {user_id}")
-    
-    async def disconnect(self, user_id: str | None):
+
+    async def disconnect(self, user_id: str | None, websocket: WebSocket | None = None):
         """Remove WebSocket connection"""
         if user_id and user_id in self.active_connections:
-            # Remove closed connections
-            self.active_connections[user_id] = [
-                ws for ws in self.active_connections[user_id]
-                if ws.client_state.name == "CONNECTED"
-            ]
-            
-            if not self.active_connections[user_id]:
-                del self.active_connections[user_id]
-            
+            if websocket is not None:
+                self._remove(user_id, websocket)
+            else:
+                # Socket unknown: remove this user's closed connections
+                self._prune(user_id)
+
             logger.info(f"❌ WebSocket disconnected: {user_id}")
-    
+
     async def broadcast(self, message: dict):
         """Send message to all connected users"""
-        for user_id, connections in list(self.active_connections.items()):
-            for websocket in connections:
-                try:
-                    await websocket.send_json(message)
-                except Exception as e:
-                    logger.error(f"Broadcast error: {e}")
-                    await self.disconnect(user_id)
-    
+        # Serialise once for every client (send_json would re-encode per socket).
+        # Sent as a text frame: the frontend JSON.parse()s event.data
+        payload = orjson.dumps(message).decode()
+
+        # Hand the frame to each client's writer; a slow client only backs up its own queue
+        targets = [
+            (user_id, websocket)
+            for user_id, connections in list(self.active_connections.items())
+            for websocket in list(connections)
+        ]
+        for i, (user_id, websocket) in enumerate(targets, 1):
+            self._enqueue(user_id, websocket, payload)
+            # Large fan-outs give other tasks (HTTP handlers, writers) a turn between batches
+            if i % BROADCAST_BATCH == 0 and i < len(targets):
+                await asyncio.sleep(0)
+
+        # Always suspend once per broadcast, so back-to-back callers let the writers drain
+        await asyncio.sleep(0)
+
     async def send_to_user(self, user_id: str, message: dict):
         """Send message to specific user"""
         if user_id in self.active_connections:
-            for websocket in self.active_connections[user_id]:
-                try:
-                    await websocket.send_json(message)
-                except Exception as e:
-                    logger.error(f"Send to user error: {e}")
-                    await self.disconnect(user_id)
+            payload = orjson.dumps(message).decode()
+            for websocket in list(self.active_connections[user_id]):
+                self._enqueue(user_id, websocket, payload)
+
+    def _enqueue(self, user_id: str, websocket: WebSocket, payload: str):
+        queue = self._queues.get(websocket)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning(f"⚠️ WebSocket client {user_id} fell {CLIENT_QUEUE_SIZE} frames behind, dropping")
+            self._remove(user_id, websocket)
+
+    async def _writer(self, user_id: str, websocket: WebSocket, queue: asyncio.Queue):
+        """Drain one client's queue onto its socket, in order"""
+        try:
+            while True:
+                payload = await queue.get()
+                await asyncio.wait_for(websocket.send_text(payload), SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Broadcast error: {e!r}")
+            self._remove(user_id, websocket)
+
+    async def _janitor_loop(self):
+        """Periodically drop sockets that closed without being disconnected"""
+        while self.active_connections:
+            await asyncio.sleep(JANITOR_INTERVAL)
+            for user_id in list(self.active_connections):
+                self._prune(user_id)
+
+    def _prune(self, user_id: str):
+        for ws in list(self.active_connections.get(user_id, ())):
+            if ws.client_state.name != "CONNECTED":
+                self._remove(user_id, ws)
+
+    def _remove(self, user_id: str, websocket: WebSocket):
+        """Forget a single socket (and the user once they have none left)"""
+        connections = self.active_connections.get(user_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
+                del self.active_connections[user_id]
+
+        self._queues.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+
+        # A socket dropped while still open (slow or failing client) must be closed,
+        # otherwise the browser sits on a silent connection and never reconnects
+        if websocket.client_state.name == "CONNECTED":
+            task = asyncio.create_task(self._close(websocket))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(websocket.close(code=DROP_CLOSE_CODE), SEND_TIMEOUT)
+        except Exception:
+            pass
@@ -9,4 +9,5 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=port,
+        ws_per_message_deflate=False,
     )
@@ -0,0 +1,20 @@
+from app.utils.decimal_guard import _clean_data_exact, clean_data, format_inr
+
+
+def test_fast_path_matches_decimal_rounding():
+    values = [i / 1000 for i in range(-20000, 20000, 7)] + [2.675, 1.005, 98765.435, 12]
+    for decimals in range(0, 7):
+        for value in values:
+            assert clean_data(value, decimals) == _clean_data_exact(value, decimals), (value, decimals)
+
+
+def test_out_of_table_decimals_use_decimal_path():
+    for decimals in (-1, -3, 7, 9):
+        for value in (1234.5678, 15.0, -987.654321):
+            assert clean_data(value, decimals) == _clean_data_exact(value, decimals), (value, decimals)
+
+
+def test_format_inr_grouping():
+    assert format_inr(112450) == "₹1,12,450.00"
+    assert format_inr(-123456789.5) == "-₹12,34,56,789.50"
+    assert format_inr(999, include_symbol=False) == "999.00"
@@ -0,0 +1,42 @@
+import random
+import statistics
+
+import pytest
+
+from app.services.pattern_recognizer import PatternRecognizer
+
+
+def _feed(prices, sentiments) -> PatternRecognizer:
+    recognizer = PatternRecognizer()
+    for price, sentiment in zip(prices, sentiments):
+        recognizer.update_data("BTC-USD", price, sentiment)
+    return recognizer
+
+
+def test_small_moves_on_high_priced_asset_are_not_flattened():
+    rng = random.Random(3)
+    prices = [98_000 + rng.uniform(-0.05, 0.05) for _ in range(50)]
+    sentiments = [50 + (p - 98_000) * 40 + rng.uniform(-2, 2) for p in prices]
+
+    recognizer = _feed(prices, sentiments)
+
+    expected = statistics.correlation(prices, sentiments)
+    assert expected > 0.3
+    assert recognizer.calculate_correlation("BTC-USD") == pytest.approx(expected, abs=1e-9)
+
+
+def test_rolling_window_matches_reference():
+    rng = random.Random(5)
+    prices = [100 + rng.gauss(0, 5) for _ in range(120)]
+    sentiments = [rng.uniform(0, 100) for _ in range(120)]
+
+    recognizer = _feed(prices, sentiments)
+
+    expected = statistics.correlation(prices[-50:], sentiments[-50:])
+    assert recognizer.calculate_correlation("BTC-USD") == pytest.approx(expected, abs=1e-9)
+
+
+def test_flat_price_series_has_zero_correlation():
+    recognizer = _feed([98_000.0] * 50, [float(i) for i in range(50)])
+
+    assert recognizer.calculate_correlation("BTC-USD") == 0.0
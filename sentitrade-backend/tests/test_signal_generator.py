@@ -0,0 +1,41 @@
+import asyncio
+import random
+
+from app.services.signal_generator import SignalContext, XAISignalGenerator
+
+LEVEL_FIELDS = ("action", "stop_loss", "take_profit", "risk_reward_ratio")
+
+
+def _contexts(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    contexts = []
+    for i in range(n):
+        bullish = i % 2 == 0
+        contexts.append(SignalContext(
+            asset=f"ASSET{i}",
+            sentiment_score=rng.uniform(80, 100) if bullish else rng.uniform(0, 20),
+            sentiment_change=rng.uniform(-10, 10),
+            price=rng.uniform(1, 100_000),
+            price_change=rng.uniform(-3, 3),
+            trend="UP" if bullish else "DOWN",
+            volatility=rng.uniform(0.1, 5.0),
+            trusted_source_count=rng.randint(0, 5),
+        ))
+    return contexts
+
+
+def test_generate_signals_matches_scalar_path():
+    generator = XAISignalGenerator()
+    contexts = _contexts(2000)
+
+    async def run():
+        batch = await generator.generate_signals(contexts)
+        scalar = [await generator.generate_signal(ctx) for ctx in contexts]
+        return batch, scalar
+
+    batch, scalar = asyncio.run(run())
+
+    assert [s is None for s in batch] == [s is None for s in scalar]
+    for b, s in zip(batch, scalar):
+        if s is not None:
+            assert {k: b[k] for k in LEVEL_FIELDS} == {k: s[k] for k in LEVEL_FIELDS}
@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.models.whale import TxType
+from app.services import whale_service as whale_module
+from app.services.whale_service import WhaleService
+
+
+class FakeSession:
+    """Session whose writes fail (or hang) until the maker is told to accept them"""
+
+    def __init__(self, maker):
+        self.maker = maker
+        self.bind = SimpleNamespace(dialect=SimpleNamespace(name="sqlite", driver="aiosqlite"))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, rows=None):
+        if self.maker.mode == "fail":
+            raise RuntimeError("database unavailable")
+        if self.maker.mode == "hang":
+            await asyncio.Event().wait()
+        self.maker.written.extend(rows)
+
+    async def commit(self):
+        pass
+
+
+class FakeSessionMaker:
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.written = []
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+def _rows(n: int) -> list:
+    return [
+        {
+            "wallet_address": f"0x{i:040x}",
+            "amount_usd": 1_000_000.0,
+            "tx_type": TxType.ACCUMULATION,
+            "timestamp": datetime.utcnow(),
+            "trust_score": 80.0,
+            "whale_age_days": 100,
+            "asset_code": "BTC",
+        }
+        for i in range(n)
+    ]
+
+
+def test_failed_flush_keeps_rows_for_retry():
+    async def run():
+        maker = FakeSessionMaker("fail")
+        service = WhaleService(maker, ws_manager=None)
+        service._buffer = _rows(3)
+        await service._flush()
+        assert len(service._buffer) == 3
+
+        maker.mode = "ok"
+        await service._flush()
+        return service, maker
+
+    service, maker = asyncio.run(run())
+
+    assert service._buffer == []
+    assert len(maker.written) == 3
+
+
+def test_requeue_is_bounded(monkeypatch):
+    monkeypatch.setattr(whale_module, "MAX_BUFFERED", 4)
+
+    async def run():
+        service = WhaleService(FakeSessionMaker("fail"), ws_manager=None)
+        service._buffer = _rows(6)
+        await service._flush()
+        return service
+
+    service = asyncio.run(run())
+
+    # The oldest rows are the ones discarded
+    assert [r["wallet_address"] for r in service._buffer] == [r["wallet_address"] for r in _rows(6)[2:]]
+
+
+def test_stop_persists_rows_from_an_interrupted_flush():
+    async def run():
+        maker = FakeSessionMaker("hang")
+        service = WhaleService(maker, ws_manager=None)
+        service._running = True
+        service._buffer = _rows(5)
+        service._flush_task = asyncio.create_task(service._flush())
+        await asyncio.sleep(0.01)  # flush is now stuck in the write
+
+        maker.mode = "ok"
+        await service.stop()
+        return maker
+
+    maker = asyncio.run(run())
+
+    assert len(maker.written) == 5
@@ -0,0 +1,68 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.ws import manager as ws_manager
+from app.ws.manager import WebSocketManager
+
+
+class FakeWebSocket:
+    """Minimal stand-in for a Starlette WebSocket; a slow one never finishes a send"""
+
+    def __init__(self, slow: bool = False):
+        self.slow = slow
+        self.sent = []
+        self.close_code = None
+        self.client_state = SimpleNamespace(name="CONNECTED")
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload: str):
+        if self.slow:
+            await asyncio.Event().wait()
+        self.sent.append(payload)
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+        self.client_state.name = "DISCONNECTED"
+
+
+def test_queue_overflow_drops_and_closes_slow_client():
+    async def run():
+        manager = WebSocketManager()
+        slow, fast = FakeWebSocket(slow=True), FakeWebSocket()
+        await manager.connect(slow, "slow")
+        await manager.connect(fast, "fast")
+
+        # One frame is stuck in the slow writer, the rest fill its queue, then one more overflows
+        for i in range(ws_manager.CLIENT_QUEUE_SIZE + 2):
+            await manager.broadcast({"n": i})
+            await asyncio.sleep(0)  # let the fast writer drain
+        await asyncio.sleep(0.01)
+        return manager, slow, fast
+
+    manager, slow, fast = asyncio.run(run())
+
+    assert "slow" not in manager.active_connections
+    assert slow.close_code == ws_manager.DROP_CLOSE_CODE
+    assert fast.close_code is None
+    assert len(fast.sent) == ws_manager.CLIENT_QUEUE_SIZE + 2
+
+
+def test_back_to_back_broadcasts_let_writers_drain():
+    async def run():
+        manager = WebSocketManager()
+        fast = FakeWebSocket()
+        await manager.connect(fast, "fast")
+
+        # Burst larger than the queue, with no yields from the caller
+        for i in range(ws_manager.CLIENT_QUEUE_SIZE + 50):
+            await manager.broadcast({"n": i})
+        await asyncio.sleep(0.01)
+        return manager, fast
+
+    manager, fast = asyncio.run(run())
+
+    assert "fast" in manager.active_connections
+    assert fast.close_code is None
+    assert len(fast.sent) == ws_manager.CLIENT_QUEUE_SIZE + 50